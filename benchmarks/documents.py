@@ -0,0 +1,101 @@
+import textwrap
+from pathlib import Path
+
+import pymupdf
+
+PAGE_SIZES = {
+    "letter": pymupdf.paper_rect("letter"),
+    "a3": pymupdf.paper_rect("a3"),
+}
+
+PARAGRAPH = (
+    "Net sales increased during the year primarily due to higher unit volumes "
+    "and favourable pricing, partially offset by foreign currency headwinds. "
+    "Gross margin as a percentage of net sales declined as a result of higher "
+    "component costs and a shift in product mix towards lower margin products. "
+)
+
+
+def add_text_page(document: pymupdf.Document, rect: pymupdf.Rect) -> None:
+    page = document.new_page(width=rect.width, height=rect.height)
+    n_lines = int((rect.height - 108) // 12)
+    lines = textwrap.wrap(PARAGRAPH * 100, width=int((rect.width - 108) / 4.5))
+    page.insert_text((54, 66), "\n".join(lines[:n_lines]), fontsize=9, lineheight=1.33)
+
+
+def add_table_page(document: pymupdf.Document, rect: pymupdf.Rect) -> None:
+    page = document.new_page(width=rect.width, height=rect.height)
+    n_columns = 6
+    n_rows = int((rect.height - 108) // 16)
+    column_width = (rect.width - 108) / n_columns
+
+    writer = pymupdf.TextWriter(page.rect)
+    for r in range(n_rows):
+        for c in range(n_columns):
+            if r == 0:
+                cell = "Item" if c == 0 else str(2000 + c)
+            else:
+                cell = f"Line {r}" if c == 0 else f"({r * c * 37:,})"
+            writer.append((58 + c * column_width, 66 + r * 16), cell, fontsize=8)
+    writer.write_text(page)
+
+    shape = page.new_shape()
+    for r in range(n_rows + 1):
+        y = 54 + r * 16
+        shape.draw_line((54, y), (rect.width - 54, y))
+    for c in range(n_columns + 1):
+        x = 54 + c * column_width
+        shape.draw_line((x, 54), (x, 54 + n_rows * 16))
+    shape.finish(width=0.5)
+    shape.commit()
+
+
+def add_chart_page(document: pymupdf.Document, rect: pymupdf.Rect) -> None:
+    """A vector bar chart with a labelled y axis and one bar per year."""
+    page = document.new_page(width=rect.width, height=rect.height)
+    left, bottom = 90, rect.height - 90
+    width, height = rect.width - 180, rect.height - 180
+    values = [120, 135, 150, 142, 168, 181]
+
+    shape = page.new_shape()
+    shape.draw_line((left, bottom), (left + width, bottom))
+    shape.draw_line((left, bottom), (left, bottom - height))
+    shape.finish(width=1)
+    for tick in range(0, 201, 50):
+        y = bottom - tick / 200 * height
+        page.insert_text((left - 30, y + 3), str(tick), fontsize=8)
+
+    bar_width = width / len(values) / 2
+    for i, value in enumerate(values):
+        x = left + (2 * i + 0.5) * bar_width
+        bar = pymupdf.Rect(x, bottom - value / 200 * height, x + bar_width, bottom)
+        shape.draw_rect(bar)
+        page.insert_text((x, bottom + 14), str(2004 + i), fontsize=8)
+    shape.finish(fill=(0.2, 0.4, 0.7), color=None)
+    shape.commit()
+    page.insert_text((left, 60), "Cumulative total return", fontsize=12)
+
+
+PAGE_KINDS = {
+    "text": add_text_page,
+    "table": add_table_page,
+    "chart": add_chart_page,
+}
+
+
+def generate_documents(output_dir: str | Path) -> dict[str, Path]:
+    """
+    Write one single-page PDF per page kind and size, returning their paths
+    keyed by '<kind>-<size>'.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for kind, add_page in PAGE_KINDS.items():
+        for size, rect in PAGE_SIZES.items():
+            path = output_dir / f"{kind}-{size}.pdf"
+            with pymupdf.open() as document:
+                add_page(document, rect)
+                document.save(path)
+            paths[f"{kind}-{size}"] = path
+    return paths
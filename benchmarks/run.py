@@ -0,0 +1,322 @@
+import gc
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import pymupdf
+import typer
+import ujson as json
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+# The settings are loaded when the workflow module is imported, provide
+# placeholders so the benchmarks can run without a .env file
+os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault("RELOAD_ENABLED", "false")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from agno.media import Image  # noqa: E402
+
+from benchmarks.documents import generate_documents  # noqa: E402
+from fin_agent.agents.document_parser.models import BoundingBox  # noqa: E402
+from fin_agent.utils.chart_extraction import extract_chart_data  # noqa: E402
+from fin_agent.utils.page_profile import profile_pdf_page  # noqa: E402
+from fin_agent.utils.document_parsing import (  # noqa: E402
+    b64_str_from_pdf_page,
+    convert_relative_to_absolute_coordinates,
+    crop_image,
+    extract_financial_tables_from_pdf,
+    extract_tables_from_pdf,
+    extract_text_from_pdf_page,
+    image_from_pdf_page,
+)
+from fin_agent.workflows.extract_document_context import ParsedPage  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+SECTION = BoundingBox(x_min=5, y_min=5, x_max=95, y_max=60)
+
+# Differences below these floors are treated as noise
+MIN_TIME_DELTA_MS = 0.05
+MIN_MEMORY_DELTA_KB = 64
+MIN_ALLOCATIONS_DELTA = 100
+
+# Operations which run on the JVM, so are missing from baselines recorded on
+# machines without Java
+JAVA_OPERATIONS = ("extract_tables_from_pdf", "extract_financial_tables_from_pdf")
+
+console = Console()
+
+
+def build_cases(pdf_paths: dict[str, Path]) -> dict[str, Callable[[], Any]]:
+    """Return the benchmarked operations keyed by '<operation>[<document>]'."""
+    cases = {
+        "convert_relative_to_absolute_coordinates": lambda: (
+            convert_relative_to_absolute_coordinates(
+                SECTION, pymupdf.Rect(0, 0, 612, 792)
+            )
+        ),
+    }
+    has_java = shutil.which("java") is not None
+
+    for name, path in pdf_paths.items():
+        document = pymupdf.open(path)
+        page = document[0]
+        image = Image(content=image_from_pdf_page(page))
+        parsed_page = ParsedPage(
+            page_content=[extract_text_from_pdf_page(page)], page_images=[image]
+        )
+        serialised_page = parsed_page.model_dump()
+
+        cases |= {
+            f"image_from_pdf_page[{name}]": lambda page=page: image_from_pdf_page(page),
+            f"b64_str_from_pdf_page[{name}]": lambda page=page: b64_str_from_pdf_page(
+                page
+            ),
+            f"crop_image[{name}]": lambda page=page, image=image: crop_image(
+                image, page.rect[2], page.rect[3], SECTION
+            ),
+            f"extract_text_from_pdf_page[{name}]": lambda page=page: (
+                extract_text_from_pdf_page(page, SECTION)
+            ),
+            f"extract_chart_data[{name}]": lambda page=page: extract_chart_data(page),
+            f"profile_pdf_page[{name}]": lambda page=page: profile_pdf_page(page),
+            f"ParsedPage.model_validate[{name}]": lambda data=serialised_page: (
+                ParsedPage.model_validate(data)
+            ),
+            f"ParsedPage.model_dump[{name}]": lambda parsed_page=parsed_page: (
+                parsed_page.model_dump()
+            ),
+        }
+        # tabula runs on the JVM, so is only benchmarked where Java is available
+        if has_java:
+            cases[f"extract_tables_from_pdf[{name}]"] = lambda path=path: (
+                extract_tables_from_pdf(str(path), 1, SECTION)
+            )
+            cases[f"extract_financial_tables_from_pdf[{name}]"] = lambda path=path: (
+                extract_financial_tables_from_pdf(str(path), 1, SECTION)
+            )
+    return cases
+
+
+def measure(
+    operation: Callable[[], Any], min_time: float = 0.5, min_iterations: int = 10
+) -> dict[str, float]:
+    """
+    Measure an operation.
+
+    Returns:
+        dict[str, float]: The fastest and the median wall time per call in
+            milliseconds (regressions are judged on the fastest, which is the
+            least sensitive to noise from other processes), and the Python memory
+            use of a call in kilobytes:
+
+            - peak_kb: the peak allocated during the call, including temporaries
+            - allocated_kb and allocations: the size and number of the blocks the
+              call allocated which are still live when it returns (its result and
+              anything it cached), from a snapshot diff. tracemalloc cannot see
+              temporaries freed before the call returns, which peak_kb covers
+            - retained_kb: the memory still allocated once the result is dropped,
+              i.e. what the call leaks or caches
+    """
+    operation()  # warm up
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_iterations or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - call_started)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = operation()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    del result
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Exclude tracemalloc's own bookkeeping from the diff
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "traceback"
+    )
+    allocated = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    allocations = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+
+    return {
+        "min_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "peak_kb": round((peak - baseline) / 1024, 1),
+        "allocated_kb": round(allocated / 1024, 1),
+        "allocations": allocations,
+        "retained_kb": round(max(retained - baseline, 0) / 1024, 1),
+    }
+
+
+def is_java_operation(name: str) -> bool:
+    return name.split("[")[0] in JAVA_OPERATIONS
+
+
+def find_unbaselined(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+) -> list[str]:
+    """Operations (or metrics) which have no baseline, so cannot be checked."""
+    return [
+        name
+        for name, result in results.items()
+        if name not in baseline or not result.keys() <= baseline[name].keys()
+    ]
+
+
+def recorded_without_java(baseline: dict[str, dict[str, float]]) -> bool:
+    return not any(is_java_operation(name) for name in baseline)
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    time_tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if (
+            result["min_ms"] > expected["min_ms"] * time_tolerance
+            and result["min_ms"] - expected["min_ms"] > MIN_TIME_DELTA_MS
+        ):
+            regressions.append(
+                f"{name}: {result['min_ms']:.3f} ms vs {expected['min_ms']:.3f} ms"
+            )
+        for metric in ("peak_kb", "allocated_kb", "retained_kb"):
+            if (
+                metric in expected
+                and result[metric] > expected[metric] * memory_tolerance
+                and result[metric] - expected[metric] > MIN_MEMORY_DELTA_KB
+            ):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.1f} vs {expected[metric]:.1f}"
+                )
+        if (
+            "allocations" in expected
+            and result["allocations"] > expected["allocations"] * memory_tolerance
+            and result["allocations"] - expected["allocations"] > MIN_ALLOCATIONS_DELTA
+        ):
+            regressions.append(
+                f"{name}: allocations {result['allocations']} vs "
+                f"{expected['allocations']}"
+            )
+    return regressions
+
+
+def print_results(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+) -> None:
+    table = Table(title="Benchmarks")
+    table.add_column("Operation", overflow="fold")
+    for column in (
+        "min ms",
+        "baseline ms",
+        "median ms",
+        "peak KB",
+        "allocated KB",
+        "allocations",
+        "retained KB",
+    ):
+        table.add_column(column, justify="right")
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get("min_ms")
+        table.add_row(
+            escape(name),
+            f"{result['min_ms']:.3f}",
+            "-" if expected is None else f"{expected:.3f}",
+            f"{result['median_ms']:.3f}",
+            f"{result['peak_kb']:.1f}",
+            f"{result['allocated_kb']:.1f}",
+            str(result["allocations"]),
+            f"{result['retained_kb']:.1f}",
+        )
+    console.print(table)
+
+
+def run_benchmarks(
+    baseline_file: Path = typer.Option(BASELINE_FILE, help="Baseline JSON file"),
+    update_baseline: bool = typer.Option(
+        False, help="Write the results to the baseline file instead of comparing"
+    ),
+    time_tolerance: float = typer.Option(
+        2.0, help="Fail if an operation is this many times slower than the baseline"
+    ),
+    memory_tolerance: float = typer.Option(
+        1.25,
+        help="Fail if an operation uses this many times more memory than the baseline",
+    ),
+    select: str = typer.Option("", help="Only run operations containing this string"),
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = build_cases(generate_documents(tmp_dir))
+        results = {
+            name: measure(operation)
+            for name, operation in cases.items()
+            if select in name
+        }
+
+    baseline = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    print_results(results, baseline)
+
+    if update_baseline:
+        baseline_file.write_text(json.dumps(baseline | results, indent=2) + "\n")
+        console.print(f"Baseline written to {baseline_file}")
+        return
+
+    failed = False
+    # New or renamed operations would otherwise go unchecked until re-baselined
+    unbaselined = find_unbaselined(results, baseline)
+    if recorded_without_java(baseline):
+        # Not a new operation, but one the baseline's machine could not run
+        java_operations = [name for name in unbaselined if is_java_operation(name)]
+        if java_operations:
+            console.print(
+                "[yellow]The baseline was recorded without Java, so table extraction "
+                "is not checked. Run with --update-baseline to add it:[/yellow]"
+            )
+            for name in java_operations:
+                console.print(f"  {escape(name)}")
+        unbaselined = [name for name in unbaselined if not is_java_operation(name)]
+    if unbaselined:
+        console.print(
+            "[red]Operations missing from the baseline "
+            "(run with --update-baseline to add them):[/red]"
+        )
+        for name in unbaselined:
+            console.print(f"  {escape(name)}")
+        failed = True
+
+    regressions = find_regressions(results, baseline, time_tolerance, memory_tolerance)
+    if regressions:
+        console.print("[red]Regressions against baseline:[/red]")
+        for regression in regressions:
+            console.print(f"  {escape(regression)}")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    console.print("[green]No regressions against baseline[/green]")
+
+
+def main():
+    typer.run(run_benchmarks)
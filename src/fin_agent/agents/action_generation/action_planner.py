@@ -1,11 +1,14 @@
 from agno.agent import Agent
-from agno.models.groq import Groq
 from agno.storage.sqlite import SqliteStorage
 from agno.tools.calculator import CalculatorTools
 from agno.tools.reasoning import ReasoningTools
 from pydantic import BaseModel
 
-from fin_agent.settings import app_settings
+from fin_agent.agents.action_generation.table_tools import (
+    TableQueryTools,
+    table_store,
+)
+from fin_agent.agents.groq import groq_model
 
 
 class ActionPlan(BaseModel):
@@ -13,98 +16,124 @@ class ActionPlan(BaseModel):
     tool_calls: list[dict[str, str]]
 
 
-action_planner = Agent(
-    model=Groq(
-        id="meta-llama/llama-4-scout-17b-16e-instruct",
-        api_key=app_settings.GROQ_API_KEY,
-        temperature=0,
-    ),
-    role="Action Planner",
-    tools=[
-        CalculatorTools(
-            include_tools=[
-                "add",
-                "subtract",
-                "multiply",
-                "divide",
-            ]
+# Sessions are keyed by session_id, so every planner can share the same storage
+storage = SqliteStorage(table_name="analyst", db_file="/tmp/fin_agent.db")
+
+
+def create_action_planner() -> Agent:
+    return Agent(
+        model=groq_model(
+            id="meta-llama/llama-4-scout-17b-16e-instruct",
+            temperature=0,
         ),
-        ReasoningTools(),
-    ],
-    instructions=[
-        "You are a part of a team of expert financial analysts.",
-        "You are an action planner.",
-        "You will be presented with a page from a financial report.",
-        "The page will include a table of data and the text before and after the table.",
-        "You will be asked questions about the data presented with the document.",
-        "Your task is to generate the series of tool calls needed for an agent to perform the calculation.",
-        "Use the reasoning tools to break down the problem and outline your thought process.",
-        "Do not actually run any calculations.",
-        "Provide your answer as a JSON object with the following keys:",
-        "- reasoning: A summary of your reasoning process.",
-        "- tool_calls: An ordered list of tool call references (in order of execution) to perform the calculation. Do not include reasoning tools. Each tool call reference should have the following keys:",
-        "    - tool: The name of the tool to use.",
-        "    - args: The arguments to pass to the tool.",
-        "",
-        "Refer to the result of previous tool calls in the args of subsequent tool calls using the template variable {{result_<idx>}} where <idx> is the index of the tool call.",
-        "Make sure all tool calls are ordered and that the arguments of each tool call are numeric.",
-        "Only return the JSON object, do not include any additional text.",
-        "Example response:",
-        """\n{"reasoning": ..., "tool_calls":  [{"tool": "add", "args": {"a": 1, "b": 2}}, {"tool": "subtract", "args": {"a": {{result_0}}, "b": 2}}]}""",
-        "If you have insufficient information to perform the calculation, return an empty list for tool_calls and explain that you require more information in your reasoning.",
-    ],
-    show_tool_calls=True,
-    debug_mode=True,
-    add_history_to_messages=True,
-    read_chat_history=True,
-    storage=SqliteStorage(table_name="analyst", db_file="/tmp/fin_agent.db"),
-)
+        role="Action Planner",
+        tools=[
+            CalculatorTools(
+                include_tools=[
+                    "add",
+                    "subtract",
+                    "multiply",
+                    "divide",
+                ]
+            ),
+            ReasoningTools(),
+        ],
+        instructions=[
+            "You are a part of a team of expert financial analysts.",
+            "You are an action planner.",
+            "You will be presented with a page from a financial report.",
+            "The page will include a table of data and the text before and after the table.",
+            "You will be asked questions about the data presented with the document.",
+            "Your task is to generate the series of tool calls needed for an agent to perform the calculation.",
+            "Use the reasoning tools to break down the problem and outline your thought process.",
+            "Do not actually run any calculations.",
+            "Provide your answer as a JSON object with the following keys:",
+            "- reasoning: A summary of your reasoning process.",
+            "- tool_calls: An ordered list of tool call references (in order of execution) to perform the calculation. Do not include reasoning tools. Each tool call reference should have the following keys:",
+            "    - tool: The name of the tool to use.",
+            "    - args: The arguments to pass to the tool.",
+            "",
+            "Refer to the result of previous tool calls in the args of subsequent tool calls using the template variable {{result_<idx>}} where <idx> is the index of the tool call.",
+            "Make sure all tool calls are ordered and that the arguments of each tool call are numeric.",
+            "Only return the JSON object, do not include any additional text.",
+            "Example response:",
+            """\n{"reasoning": ..., "tool_calls":  [{"tool": "add", "args": {"a": 1, "b": 2}}, {"tool": "subtract", "args": {"a": {{result_0}}, "b": 2}}]}""",
+            "If you have insufficient information to perform the calculation, return an empty list for tool_calls and explain that you require more information in your reasoning.",
+        ],
+        show_tool_calls=True,
+        debug_mode=True,
+        add_history_to_messages=True,
+        read_chat_history=True,
+        storage=storage,
+    )
+
 
-action_planner_advanced = Agent(
-    model=Groq(
-        id="meta-llama/llama-4-scout-17b-16e-instruct",
-        api_key=app_settings.GROQ_API_KEY,
-        temperature=0,
-    ),
-    role="Action Planner",
-    tools=[
-        CalculatorTools(
-            include_tools=[
-                "add",
-                "subtract",
-                "multiply",
-                "divide",
-            ]
+ADVANCED_PLANNER_INSTRUCTIONS = [
+    "You are a part of a team of expert financial analysts.",
+    "You are an action planner.",
+    "You will be presented with a page from a financial report, along with a question to answer.",
+    "The page will include some article text.",
+    "The page may also include some tables of data.",
+    "Some charts or graphs may also be provided as images.",
+    "Charts drawn with vector graphics are instead provided as tables of the values read from the chart, with one row per x-axis label and one column per series.",
+    "Your task is to generate the series of tool calls needed for an agent to perform the calculation.",
+    "Use the reasoning tools to break down the problem and outline your thought process.",
+    "Do not actually run any calculations.",
+    "Provide your answer as a JSON object with the following keys:",
+    "- reasoning: A summary of your reasoning process.",
+    "- tool_calls: An ordered list of tool call references (in order of execution) to perform the calculation. Do not include reasoning tools. Each tool call reference should have the following keys:",
+    "    - tool: The name of the tool to use.",
+    "    - args: The arguments to pass to the tool.",
+    "",
+    "Do not include any reasoning tools in the tool_calls.",
+    "Refer to the result of previous tool calls in the args of subsequent tool calls using the template variable {{result_<idx>}} where <idx> is the index of the tool call.",
+    "Make sure all tool calls are ordered and that the arguments of each tool call are numeric.",
+    "Only return the JSON object, do not include any additional text.",
+    "Example response:",
+    """\n{"reasoning": ..., "tool_calls":  [{"tool": "add", "args": {"a": 1, "b": 2}}, {"tool": "subtract", "args": {"a": {{result_0}}, "b": 2}}]}""",
+    "If you have insufficient information to perform the calculation, return an empty list for tool_calls and explain that you require more information in your reasoning.",
+]
+
+
+def advanced_planner_instructions(agent: Agent) -> list[str]:
+    """
+    The advanced planner's instructions, which explain how to look up table values
+    when tables are registered for the agent's session (see `table_store`).
+    """
+    if not table_store.get_tables(agent.session_id):
+        return ADVANCED_PLANNER_INSTRUCTIONS
+    return ADVANCED_PLANNER_INSTRUCTIONS + [
+        "Tables are provided as schemas listing their row and column headers, without their values.",
+        "Use the lookup_table_value tool to fetch each value you need, and use the returned numbers as the arguments of your tool calls.",
+        "Do not include lookup_table_value in the tool_calls.",
+    ]
+
+
+def create_action_planner_advanced() -> Agent:
+    return Agent(
+        model=groq_model(
+            id="meta-llama/llama-4-scout-17b-16e-instruct",
+            temperature=0,
         ),
-        # ReasoningTools(),
-    ],
-    instructions=[
-        "You are a part of a team of expert financial analysts.",
-        "You are an action planner.",
-        "You will be presented with a page from a financial report, along with a question to answer.",
-        "The page will include some article text.",
-        "The page may also include some tables of data.",
-        "Some charts or graphs may also be provided as images.",
-        "Your task is to generate the series of tool calls needed for an agent to perform the calculation.",
-        "Use the reasoning tools to break down the problem and outline your thought process.",
-        "Do not actually run any calculations.",
-        "Provide your answer as a JSON object with the following keys:",
-        "- reasoning: A summary of your reasoning process.",
-        "- tool_calls: An ordered list of tool call references (in order of execution) to perform the calculation. Do not include reasoning tools. Each tool call reference should have the following keys:",
-        "    - tool: The name of the tool to use.",
-        "    - args: The arguments to pass to the tool.",
-        "",
-        "Do not include any reasoning tools in the tool_calls.",
-        "Refer to the result of previous tool calls in the args of subsequent tool calls using the template variable {{result_<idx>}} where <idx> is the index of the tool call.",
-        "Make sure all tool calls are ordered and that the arguments of each tool call are numeric.",
-        "Only return the JSON object, do not include any additional text.",
-        "Example response:",
-        """\n{"reasoning": ..., "tool_calls":  [{"tool": "add", "args": {"a": 1, "b": 2}}, {"tool": "subtract", "args": {"a": {{result_0}}, "b": 2}}]}""",
-        "If you have insufficient information to perform the calculation, return an empty list for tool_calls and explain that you require more information in your reasoning.",
-    ],
-    show_tool_calls=True,
-    debug_mode=True,
-    add_history_to_messages=True,
-    read_chat_history=True,
-    storage=SqliteStorage(table_name="analyst", db_file="/tmp/fin_agent.db"),
-)
+        agent_id="action_planner_advanced",
+        name="action_planner_advanced",
+        role="Action Planner",
+        tools=[
+            CalculatorTools(
+                include_tools=[
+                    "add",
+                    "subtract",
+                    "multiply",
+                    "divide",
+                ]
+            ),
+            # ReasoningTools(),
+            TableQueryTools(),
+        ],
+        instructions=advanced_planner_instructions,
+        show_tool_calls=True,
+        debug_mode=True,
+        add_history_to_messages=True,
+        read_chat_history=True,
+        storage=storage,
+    )
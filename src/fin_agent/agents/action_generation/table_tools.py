@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+import ujson as json
+from agno.agent import Agent
+from agno.tools import Toolkit
+
+from fin_agent.utils.financial_tables import FinancialTable
+
+
+class TableStore:
+    """
+    The tables of the document under discussion in each agent session, with a
+    cache of the lookups already made in that session. Only the most recently
+    used sessions are kept.
+    """
+
+    def __init__(self, max_sessions: int = 256):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, tuple[dict[str, FinancialTable], dict]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def set_tables(self, session_id: str, tables: list[FinancialTable]) -> None:
+        with self._lock:
+            self._sessions[session_id] = ({table.name: table for table in tables}, {})
+            self._touch(session_id)
+
+    def add_tables(self, session_id: str, tables: list[FinancialTable]) -> None:
+        """Add tables to a session, replacing any with the same names."""
+        names = {table.name for table in tables}
+        with self._lock:
+            session_tables, cache = self._sessions.get(session_id, ({}, {}))
+            session_tables = session_tables | {table.name: table for table in tables}
+            cache = {key: value for key, value in cache.items() if key[0] not in names}
+            self._sessions[session_id] = (session_tables, cache)
+            self._touch(session_id)
+
+    def _touch(self, session_id: str) -> None:
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def get_tables(self, session_id: str) -> dict[str, FinancialTable]:
+        return self._session(session_id)[0]
+
+    def _session(self, session_id: str) -> tuple[dict[str, FinancialTable], dict]:
+        with self._lock:
+            if session_id not in self._sessions:
+                return {}, {}
+            self._sessions.move_to_end(session_id)
+            return self._sessions[session_id]
+
+    def lookup(self, session_id: str, table: str, row: str, column: str) -> str:
+        tables, cache = self._session(session_id)
+        key = (table, row, column)
+        if key not in cache:
+            if table not in tables:
+                return f"Unknown table '{table}', choose from: {list(tables)}"
+            try:
+                cache[key] = json.dumps(tables[table].lookup(row, column))
+            except KeyError as e:
+                # Failed lookups are not cached, so are retried if the tables change
+                return e.args[0]
+        return cache[key]
+
+
+table_store = TableStore()
+
+
+def tables_prompt(tables: list[FinancialTable]) -> str:
+    """The schemas of the tables, to give the planner in place of their values."""
+    return "\n".join(
+        ["Tables (look up values with lookup_table_value):"]
+        + [table.schema() for table in tables]
+    )
+
+
+class TableQueryTools(Toolkit):
+    """Look up values from the tables registered for the agent's session."""
+
+    def __init__(self, store: TableStore = table_store):
+        super().__init__(name="table_query_tools")
+        self.store = store
+        self.register(self.lookup_table_value)
+
+    def lookup_table_value(
+        self, agent: Agent, table: str, row: str, column: str
+    ) -> str:
+        """
+        Look up a single value from one of the document tables.
+
+        Args:
+            table (str): The name of the table, as given in the table schema
+            row (str): The row header, e.g. "net income"
+            column (str): The column header, e.g. "2009"
+
+        Returns:
+            str: A JSON object with the matched headers, the numeric value and its
+                unit ("%" or a currency), or an error message listing valid headers
+        """
+        return self.store.lookup(agent.session_id, table, row, column)
@@ -1,12 +1,11 @@
 import ujson as json
 from agno.agent import Agent
 from agno.media import Image
-from agno.models.groq import Groq
 from agno.workflow import Workflow
 from pydantic import BaseModel, Field
 
 from fin_agent.agents.document_parser.models import BoundingBox, PageSection
-from fin_agent.settings import app_settings
+from fin_agent.agents.groq import groq_model
 
 
 class BBoxInspectorResponse(BaseModel):
@@ -25,36 +24,36 @@ class BBoxInspectorResponse(BaseModel):
     )
 
 
-bbox_inspector = Agent(
-    model=Groq(
-        id="meta-llama/llama-4-scout-17b-16e-instruct",
-        api_key=app_settings.GROQ_API_KEY,
-        temperature=0,
-        top_p=1,
-    ),
-    agent_id="bbox_inspector",
-    name="bbox_inspector",
-    instructions=[
-        "You are an expert quality inspector.",
-        "You will provided with a cropped image of a section of a company financial report.",
-        "You will also be provided with a description of the data that the cropped image was intended to contain.",
-        "Your task is to inspect the cropped image and determine if it matches the intended section exactly.",
-        "The content_type field mentioned within `intended_data` will mention one of three content types: text, table, or graph.",
-        "If the content_type field mentions a table, the cropped image should ONLY contain a table.",
-        "If the content_type field mentions a graph, the cropped image should ONLY contain a graph.",
-        "If the cropped image contains any additional content, this should be treated as inaccurate.",
-        "If the cropped image is inaccurate, suggest a new and improved bounding box that will make it accurate.",
-        "The full page image should only be used to determine how the bounding box should be modified.",
-    ],
-    debug_mode=True,
-    response_model=BBoxInspectorResponse,
-    structured_outputs=True,
-    parse_response=True,
-)
+def create_bbox_inspector() -> Agent:
+    return Agent(
+        model=groq_model(
+            id="meta-llama/llama-4-scout-17b-16e-instruct",
+            temperature=0,
+            top_p=1,
+        ),
+        agent_id="bbox_inspector",
+        name="bbox_inspector",
+        instructions=[
+            "You are an expert quality inspector.",
+            "You will provided with a cropped image of a section of a company financial report.",
+            "You will also be provided with a description of the data that the cropped image was intended to contain.",
+            "Your task is to inspect the cropped image and determine if it matches the intended section exactly.",
+            "The content_type field mentioned within `intended_data` will mention one of three content types: text, table, or graph.",
+            "If the content_type field mentions a table, the cropped image should ONLY contain a table.",
+            "If the content_type field mentions a graph, the cropped image should ONLY contain a graph.",
+            "If the cropped image contains any additional content, this should be treated as inaccurate.",
+            "If the cropped image is inaccurate, suggest a new and improved bounding box that will make it accurate.",
+            "The full page image should only be used to determine how the bounding box should be modified.",
+        ],
+        debug_mode=True,
+        response_model=BBoxInspectorResponse,
+        structured_outputs=True,
+        parse_response=True,
+    )
 
 
 if __name__ == "__main__":
-    response = bbox_inspector.run(
+    response = create_bbox_inspector().run(
         message=json.dumps(
             {
                 "intended_data": {
@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import Any
+
+from agno.models.groq import Groq
+from groq import AsyncGroq, Groq as GroqClient
+
+from fin_agent.settings import app_settings
+
+
+class _SharedClient:
+    """
+    agno deep copies models (e.g. when copying agents and workflows), which would
+    otherwise copy the clients and their connection pools, leaving half-built
+    copies. Shared clients are returned as they are instead.
+    """
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class SharedGroqClient(_SharedClient, GroqClient):
+    pass
+
+
+class SharedAsyncGroqClient(_SharedClient, AsyncGroq):
+    pass
+
+
+@lru_cache
+def groq_client() -> GroqClient:
+    """A process-wide Groq client, so that agents share its connection pool."""
+    return SharedGroqClient(api_key=app_settings.GROQ_API_KEY)
+
+
+@lru_cache
+def async_groq_client() -> AsyncGroq:
+    return SharedAsyncGroqClient(api_key=app_settings.GROQ_API_KEY)
+
+
+def groq_model(id: str, **kwargs: Any) -> Groq:
+    """
+    Create a Groq model backed by the shared clients. Agents mutate their model
+    during a run, so each agent needs its own model instance.
+    """
+    return Groq(
+        id=id,
+        api_key=app_settings.GROQ_API_KEY,
+        client=groq_client(),
+        async_client=async_groq_client(),
+        **kwargs,
+    )
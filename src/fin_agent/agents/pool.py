@@ -0,0 +1,140 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from agno.agent import Agent
+
+
+class AgentPool:
+    """
+    A pool of interchangeable agents built by a factory.
+
+    agno agents keep per-run state (run id, messages, session), so an agent must
+    only serve one request at a time. Each call to `acquire` hands out an agent
+    that no other caller holds, building a new one when none are idle. Agents
+    have their session and memory cleared when they are returned, so no state
+    carries over between requests.
+    """
+
+    def __init__(self, factory: Callable[[], Agent], max_idle: int = 8):
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: list[Agent] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _reset(agent: Agent) -> None:
+        # Like Agent.new_session, but without creating a session in storage
+        agent.agent_session = None
+        agent.session_id = None
+        if agent.model is not None:
+            agent.model.clear()
+        if agent.memory is not None:
+            agent.memory.clear()
+
+    @contextmanager
+    def acquire(self, session_id: str | None = None) -> Iterator[Agent]:
+        with self._lock:
+            agent = self._idle.pop() if self._idle else None
+        if agent is None:
+            agent = self.factory()
+        if session_id is not None:
+            agent.session_id = session_id
+
+        try:
+            yield agent
+        finally:
+            self._reset(agent)
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(agent)
+
+    def clear(self) -> int:
+        """
+        Drop the idle agents, e.g. to release memory.
+
+        Returns:
+            int: The number of agents dropped
+        """
+        with self._lock:
+            n_idle = len(self._idle)
+            self._idle.clear()
+        return n_idle
+
+
+class PooledAgent(Agent):
+    """
+    An agent which serves each run from a pool of agents built by the factory.
+
+    Servers such as the agno Playground call `run`/`arun` on the one agent they
+    were given, so registering a plain agent would share its run state between
+    concurrent requests. A PooledAgent carries the configuration of the agents it
+    pools (for listing, sessions and storage) but hands every run to an agent
+    acquired from the pool, held until the response (or stream) is complete.
+    """
+
+    def __init__(self, factory: Callable[[], Agent], max_idle: int = 8):
+        template = factory()
+        template.set_agent_id()
+        self.__dict__.update(template.__dict__)
+
+        def create_agent() -> Agent:
+            # Pooled agents share the agent id, so their sessions are stored as
+            # sessions of this agent
+            agent = factory()
+            agent.agent_id = template.agent_id
+            return agent
+
+        self.pool = AgentPool(create_agent, max_idle=max_idle)
+
+    def _is_streaming(self, stream: bool | None) -> bool:
+        return bool(self.stream if stream is None else stream) and self.is_streamable
+
+    @contextmanager
+    def _acquire(self, session_id: str | None) -> Iterator[Agent]:
+        with self.pool.acquire(session_id) as agent:
+            agent.monitoring = self.monitoring
+            yield agent
+
+    def run(
+        self,
+        message: Any = None,
+        *,
+        stream: bool | None = None,
+        session_id: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if self._is_streaming(stream):
+            return self._run_stream(message, session_id=session_id, **kwargs)
+        with self._acquire(session_id) as agent:
+            return agent.run(message, stream=False, session_id=session_id, **kwargs)
+
+    def _run_stream(
+        self, message: Any, session_id: str | None, **kwargs: Any
+    ) -> Iterator[Any]:
+        with self._acquire(session_id) as agent:
+            yield from agent.run(message, stream=True, session_id=session_id, **kwargs)
+
+    async def arun(
+        self,
+        message: Any = None,
+        *,
+        stream: bool | None = None,
+        session_id: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if self._is_streaming(stream):
+            return self._arun_stream(message, session_id=session_id, **kwargs)
+        with self._acquire(session_id) as agent:
+            return await agent.arun(
+                message, stream=False, session_id=session_id, **kwargs
+            )
+
+    async def _arun_stream(
+        self, message: Any, session_id: str | None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        with self._acquire(session_id) as agent:
+            async for chunk in await agent.arun(
+                message, stream=True, session_id=session_id, **kwargs
+            ):
+                yield chunk
@@ -0,0 +1,167 @@
+import re
+from pathlib import Path
+from typing import Any, Iterator
+
+import polars as pl
+import typer
+import ujson as json
+
+FILENAME_PATTERN = re.compile(
+    r"^(?P<company>[^/]+)/(?P<year>\d{4})/page_(?P<page>\d+)\.pdf$"
+)
+
+SCHEMA = {
+    "id": pl.String,
+    "filename": pl.String,
+    "company": pl.String,
+    "year": pl.Int32,
+    "page_number": pl.Int32,
+    "pre_text": pl.List(pl.String),
+    "post_text": pl.List(pl.String),
+    "table": pl.List(pl.List(pl.String)),
+    "questions": pl.List(pl.String),
+    "programs": pl.List(pl.String),
+    "answers": pl.List(pl.String),
+    "turn_questions": pl.List(pl.String),
+    "turn_programs": pl.List(pl.String),
+    "turn_answers": pl.List(pl.String),
+    "n_turns": pl.Int32,
+    "n_questions": pl.Int32,
+    "is_multi_turn": pl.Boolean,
+    "is_hybrid": pl.Boolean,
+}
+
+
+def _flatten_example(example: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flatten a single ConvFinQA example into a row matching SCHEMA.
+
+    Single question examples store their question under `qa`, whereas examples
+    combining two questions (hybrid conversations) store them under `qa_0` and
+    `qa_1`. The conversational turns are taken from the `annotation` block. Turn
+    answers are kept as strings, as some are not numeric (e.g. "yes").
+    """
+    if "qa" in example:
+        qas = [example["qa"]]
+    else:
+        qas = [example[key] for key in sorted(example) if key.startswith("qa_")]
+
+    filename = example["filename"]
+    match = FILENAME_PATTERN.match(filename)
+    annotation = example.get("annotation", {})
+    turn_questions = annotation.get("dialogue_break", [])
+
+    return {
+        "id": example["id"],
+        "filename": filename,
+        "company": match["company"] if match else None,
+        "year": int(match["year"]) if match else None,
+        "page_number": int(match["page"]) if match else None,
+        "pre_text": example.get("pre_text", []),
+        "post_text": example.get("post_text", []),
+        "table": [[str(cell) for cell in row] for row in example.get("table", [])],
+        "questions": [qa["question"] for qa in qas],
+        "programs": [qa.get("program", "") for qa in qas],
+        "answers": [str(qa.get("answer", "")) for qa in qas],
+        "turn_questions": turn_questions,
+        "turn_programs": annotation.get("turn_program", []),
+        "turn_answers": [str(a) for a in annotation.get("exe_ans_list", [])],
+        "n_turns": len(turn_questions),
+        "n_questions": len(qas),
+        "is_multi_turn": len(turn_questions) > 1,
+        "is_hybrid": len(qas) > 1,
+    }
+
+
+def convert_convfinqa(json_path: str | Path, output_path: str | Path) -> Path:
+    """
+    Convert a ConvFinQA JSON split (e.g. train.json) into an Arrow IPC file.
+
+    The file is written uncompressed so that it can be memory-mapped when read.
+
+    Args:
+        json_path (str | Path): Path to the ConvFinQA JSON file
+        output_path (str | Path): Path of the Arrow IPC file to write
+
+    Returns:
+        Path: The path of the written file
+    """
+    with open(json_path, "rb") as f:
+        examples = json.load(f)
+
+    frame = pl.DataFrame(
+        [_flatten_example(example) for example in examples], schema=SCHEMA
+    )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    frame.write_ipc(output_path, compression="uncompressed")
+    return output_path
+
+
+class ConvFinQADataset:
+    """A columnar, memory-mapped view over a converted ConvFinQA split."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.frame = pl.read_ipc(self.path, memory_map=True)
+
+    @classmethod
+    def from_json(
+        cls, json_path: str | Path, output_path: str | Path | None = None
+    ) -> "ConvFinQADataset":
+        """
+        Load a ConvFinQA JSON split, converting it on first use. The converted file
+        is written next to the JSON file unless output_path is given and is reused
+        for as long as it is newer than the JSON file.
+        """
+        json_path = Path(json_path)
+        output_path = Path(output_path or json_path.with_suffix(".arrow"))
+        if (
+            not output_path.exists()
+            or output_path.stat().st_mtime < json_path.stat().st_mtime
+        ):
+            convert_convfinqa(json_path, output_path)
+        return cls(output_path)
+
+    def __len__(self) -> int:
+        return self.frame.height
+
+    def filter(self, *predicates: pl.Expr, **constraints: Any) -> "ConvFinQADataset":
+        """
+        Return a new dataset containing only the matching examples, e.g.
+        `dataset.filter(is_hybrid=True)` or `dataset.filter(pl.col("year") > 2010)`.
+        """
+        dataset = object.__new__(ConvFinQADataset)
+        dataset.path = self.path
+        dataset.frame = self.frame.filter(*predicates, **constraints)
+        return dataset
+
+    def sample(
+        self, n: int, *predicates: pl.Expr, seed: int | None = None, **constraints: Any
+    ) -> list[dict[str, Any]]:
+        """Sample n examples (as row dicts), optionally filtered first."""
+        frame = self.frame
+        if predicates or constraints:
+            frame = frame.filter(*predicates, **constraints)
+        return frame.sample(n=min(n, frame.height), seed=seed).to_dicts()
+
+    def get(self, filename: str) -> list[dict[str, Any]]:
+        """Return all examples built from the given report page, e.g. 'JKHY/2009/page_28.pdf'."""
+        return self.frame.filter(pl.col("filename") == filename).to_dicts()
+
+    def iter_batches(self, batch_size: int = 32) -> Iterator[pl.DataFrame]:
+        """Iterate over the dataset in batches of at most batch_size rows."""
+        for offset in range(0, self.frame.height, batch_size):
+            yield self.frame.slice(offset, batch_size)
+
+
+def run_conversion(
+    json_path: Path = typer.Argument(..., help="Path to a ConvFinQA JSON split"),
+    output_path: Path = typer.Argument(..., help="Arrow IPC file to write"),
+):
+    output_path = convert_convfinqa(json_path, output_path)
+    typer.echo(f"Wrote {len(ConvFinQADataset(output_path))} examples to {output_path}")
+
+
+def main():
+    typer.run(run_conversion)
@@ -0,0 +1,3 @@
+from fin_agent.evaluate.action_planner import main as run_evaluator
+
+__all__ = ["run_evaluator"]
@@ -0,0 +1,91 @@
+import uuid
+from pathlib import Path
+from textwrap import dedent
+from typing import Any
+
+import typer
+import ujson as json
+
+from fin_agent.agents.action_generation.action_planner import (
+    create_action_planner_advanced,
+)
+from fin_agent.agents.action_generation.table_tools import table_store, tables_prompt
+from fin_agent.datasets.convfinqa import ConvFinQADataset
+from fin_agent.evaluate.agent import EvaluationResult, create_eval_agent
+from fin_agent.utils.financial_tables import FinancialTable
+
+EVALUATION_CRITERIA = dedent("""The action planner should generate the series of tool calls needed to answer the question.
+The expected program shows one correct series of operations, where #<idx> refers to the result of an earlier operation.
+Score as follows:
+- 0 if executing the agent's tool calls would not produce the expected answer
+- 1 if executing the agent's tool calls would produce the expected answer
+
+Differences in rounding, or in whether a percentage is expressed as a fraction, should be ignored.
+""")
+
+
+def example_tables(example: dict[str, Any]) -> list[FinancialTable]:
+    tables = [FinancialTable.from_rows("table_1", example["table"])]
+    return [table for table in tables if table.frame.height]
+
+
+def planner_message(example: dict[str, Any], tables: list[FinancialTable]) -> str:
+    """
+    Present a ConvFinQA example to the planner as its page would come out of the
+    extraction workflow: the text, with the schemas of the tables in place of
+    their values (which are registered for the session).
+    """
+    sections = [
+        "\n".join(example["pre_text"]),
+        tables_prompt(tables) if tables else "",
+        "\n".join(example["post_text"]),
+        f"Question: {example['questions'][0]}",
+    ]
+    return "\n\n".join(section for section in sections if section)
+
+
+def evaluate_action_planner(
+    dataset: ConvFinQADataset, n_examples: int = 10, seed: int | None = None
+) -> list[EvaluationResult]:
+    """
+    Evaluate the advanced action planner on a sample of single question ConvFinQA
+    examples, scoring each plan against the example's program and answer.
+    """
+    evaluations = []
+    for example in dataset.sample(n_examples, is_hybrid=False, seed=seed):
+        # Fresh agents per example, so no conversation history carries over
+        session_id = str(uuid.uuid4())
+        tables = example_tables(example)
+        table_store.set_tables(session_id, tables)
+        response = create_action_planner_advanced().run(
+            planner_message(example, tables), session_id=session_id
+        )
+        evaluation = create_eval_agent().run(
+            message=json.dumps(
+                {
+                    "question": example["questions"][0],
+                    "expected_program": example["programs"][0],
+                    "expected_answer": example["answers"][0],
+                    "agent_response": response.content,
+                    "evaluation_criteria": EVALUATION_CRITERIA,
+                }
+            )
+        )
+        evaluations.append(evaluation.content)
+    return evaluations
+
+
+def run_evaluation(
+    json_path: Path = typer.Argument(..., help="Path to a ConvFinQA JSON split"),
+    n_examples: int = typer.Option(10, help="Number of examples to evaluate"),
+    seed: int | None = typer.Option(None, help="Seed for sampling examples"),
+):
+    evaluations = evaluate_action_planner(
+        ConvFinQADataset.from_json(json_path), n_examples, seed
+    )
+    score = sum(evaluation.accuracy_score for evaluation in evaluations)
+    typer.echo(f"Action planner accuracy: {score}/{len(evaluations)}")
+
+
+def main():
+    typer.run(run_evaluation)
@@ -4,8 +4,10 @@ from textwrap import dedent
 import ujson as json
 from agno.media import Image
 
-from fin_agent.evaluate.agent import eval_agent
-from fin_agent.agents.document_parser.content_summarizer import content_summarizer
+from fin_agent.evaluate.agent import create_eval_agent
+from fin_agent.agents.document_parser.content_summarizer import (
+    create_content_summarizer,
+)
 
 
 EXAMPLES_DIR = (Path(__file__).parent.parent.parent.parent / "examples").resolve()
@@ -14,7 +16,7 @@ assert EXAMPLES_DIR.exists(), "Examples directory does not exist"
 
 
 def evaluate_content_summarizer():
-    agent_instructions = content_summarizer.instructions
+    agent_instructions = create_content_summarizer().instructions
     expected_answers = [
         {
             "sections": [
@@ -74,10 +76,11 @@ def evaluate_content_summarizer():
     for example in examples:
         message = example["message"]
         images = example["images"]
-        response = content_summarizer.run(message="", images=images)
+        # Fresh agents per example, so no state carries over between examples
+        response = create_content_summarizer().run(message="", images=images)
         message["agent_response"] = response.content.model_dump()
         message["evaluation_criteria"] = evaluation_criteria
-        evaluation = eval_agent.run(
+        evaluation = create_eval_agent().run(
             message=json.dumps(message),
             images=images,
         )
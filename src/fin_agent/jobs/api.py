@@ -0,0 +1,62 @@
+from functools import lru_cache
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from fin_agent.jobs.queue import JobPriority, JobQueue, JobStatus
+from fin_agent.jobs.worker import EXTRACT_PAGE_JOB
+from fin_agent.settings import app_settings
+
+
+class ExtractionJobRequest(BaseModel):
+    pdf_url: str
+    page_number: int
+    priority: Literal["interactive", "bulk"] = "interactive"
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    attempts: int
+    error: str | None = None
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    return JobQueue(app_settings.JOB_QUEUE_DB_FILE)
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=JobStatusResponse, status_code=202)
+def submit_extraction_job(
+    request: ExtractionJobRequest, queue: JobQueue = Depends(get_job_queue)
+):
+    job_id = queue.submit(
+        kind=EXTRACT_PAGE_JOB,
+        payload={"pdf_url": request.pdf_url, "page_number": request.page_number},
+        priority=JobPriority[request.priority.upper()],
+    )
+    return queue.get(job_id).model_dump()
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+def get_job_status(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.model_dump()
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, queue: JobQueue = Depends(get_job_queue)) -> Any:
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} has status '{job.status}'"
+        )
+    return job.result
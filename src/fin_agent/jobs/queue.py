@@ -0,0 +1,261 @@
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+import ujson as json
+from pydantic import BaseModel
+
+JobStatus = Literal["pending", "running", "succeeded", "failed"]
+
+
+class JobPriority(IntEnum):
+    """Higher priority jobs are always claimed first."""
+
+    BULK = 0
+    INTERACTIVE = 10
+
+
+class Job(BaseModel):
+    job_id: str
+    kind: str
+    payload: dict[str, Any]
+    priority: int
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    lease_owner: str | None = None
+    lease_expires_at: float | None = None
+    result: Any = None
+    error: str | None = None
+    created_at: float
+    updated_at: float
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim_order
+    ON jobs (status, priority DESC, created_at);
+"""
+
+
+class JobQueue:
+    """
+    A durable job queue backed by a single SQLite file.
+
+    Workers claim jobs by taking a time-limited lease. A job whose lease expires
+    (e.g. because its worker died) becomes claimable again, and failed jobs are
+    retried with a linear backoff until max_attempts is reached. Any number of
+    worker processes on the same host can share the queue file.
+
+    The queue is single-host only: the file must be on a local filesystem. WAL
+    mode relies on shared memory between the processes using the file, and
+    SQLite's file locking is unreliable on network filesystems (NFS, SMB), so
+    workers on other machines must not open the file over the network.
+    """
+
+    def __init__(
+        self,
+        db_file: str | Path,
+        lease_seconds: float = 600,
+        retry_backoff_seconds: float = 5,
+    ):
+        self.db_file = str(db_file)
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        with self._connect() as connection:
+            # WAL lets workers read while a claim holds the write lock. It only
+            # works for processes on one host (see the class docstring)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            # Take the write lock up front so concurrent claims cannot interleave
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Job:
+        job = dict(row)
+        job.pop("available_at")
+        job["payload"] = json.loads(job["payload"])
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return Job.model_validate(job)
+
+    def submit(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        priority: int = JobPriority.INTERACTIVE,
+        max_attempts: int = 3,
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO jobs (job_id, kind, payload, priority, status,
+                    max_attempts, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 'pending', ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    kind,
+                    json.dumps(payload),
+                    int(priority),
+                    max_attempts,
+                    now,
+                    now,
+                    now,
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim(self, worker_id: str) -> Job | None:
+        """
+        Lease the highest priority job that is ready to run, or return None if
+        there is nothing to do.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            # Jobs abandoned by a worker on their final attempt are not retried
+            connection.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = 'Lease expired',
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE status = 'running' AND lease_expires_at < ?
+                    AND attempts >= max_attempts
+                """,
+                (now, now),
+            )
+            row = connection.execute(
+                """
+                SELECT job_id FROM jobs
+                WHERE (status = 'pending' AND available_at <= ?)
+                    OR (status = 'running' AND lease_expires_at < ?)
+                ORDER BY priority DESC, created_at
+                LIMIT 1
+                """,
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            connection.execute(
+                """
+                UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                    lease_owner = ?, lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (worker_id, now + self.lease_seconds, now, row["job_id"]),
+            )
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)
+            ).fetchone()
+        return self._to_job(row)
+
+    def extend_lease(self, job_id: str, worker_id: str) -> bool:
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (now + self.lease_seconds, now, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        """Store the result of a job. Returns False if the worker no longer holds the lease."""
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs SET status = 'succeeded', result = ?, error = NULL,
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (json.dumps(result), now, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record a failed attempt, scheduling a retry if attempts remain."""
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                """
+                SELECT attempts, max_attempts FROM jobs
+                WHERE job_id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+
+            retry = row["attempts"] < row["max_attempts"]
+            connection.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, available_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (
+                    "pending" if retry else "failed",
+                    error,
+                    now + self.retry_backoff_seconds * row["attempts"],
+                    now,
+                    job_id,
+                ),
+            )
+        return True
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
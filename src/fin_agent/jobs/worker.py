@@ -0,0 +1,240 @@
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from multiprocessing import Process
+from typing import TYPE_CHECKING, Any, Callable
+
+import typer
+import ujson as json
+from agno.utils.log import logger
+
+from fin_agent.jobs.queue import Job, JobQueue
+from fin_agent.settings import app_settings
+from fin_agent.utils.memory import (
+    MB,
+    MemoryBudget,
+    current_rss_bytes,
+    release_memory,
+)
+
+if TYPE_CHECKING:
+    from fin_agent.workflows.extract_document_context import (
+        PdfContextExtractionWorkflow,
+    )
+
+EXTRACT_PAGE_JOB = "extract_page"
+# Exit code of workers which cannot run at all with their settings, which are
+# therefore not restarted
+EXIT_MEMORY_BUDGET_TOO_LOW = 2
+
+
+def create_extraction_workflow() -> "PdfContextExtractionWorkflow":
+    # Imported lazily so the queue can be used without loading the agents
+    from fin_agent.workflows.extract_document_context import (
+        PdfContextExtractionWorkflow,
+    )
+
+    return PdfContextExtractionWorkflow()
+
+
+def extract_page_handler(
+    workflow: "PdfContextExtractionWorkflow",
+) -> Callable[[Job], Any]:
+    # One workflow per worker process, so its agents are reused across jobs
+    def handle(job: Job) -> Any:
+        response = workflow.run(message=json.dumps(job.payload))
+        return response.content.model_dump()
+
+    return handle
+
+
+def _keep_lease_alive(
+    queue: JobQueue, job: Job, worker_id: str, stop: threading.Event
+) -> None:
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.extend_lease(job.job_id, worker_id):
+            return
+
+
+def process_next_job(
+    queue: JobQueue, worker_id: str, handlers: dict[str, Callable[[Job], Any]]
+) -> bool:
+    """
+    Claim and run a single job.
+
+    Returns:
+        bool: True if a job was claimed, False if the queue was empty
+    """
+    job = queue.claim(worker_id)
+    if job is None:
+        return False
+
+    logger.info(f"Worker {worker_id} running job {job.job_id} ({job.kind})")
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_lease_alive, args=(queue, job, worker_id, stop), daemon=True
+    )
+    heartbeat.start()
+    try:
+        handler = handlers.get(job.kind)
+        if handler is None:
+            raise ValueError(f"No handler registered for job kind '{job.kind}'")
+        result = handler(job)
+    except Exception:
+        logger.error(f"Job {job.job_id} failed on worker {worker_id}")
+        queue.fail(job.job_id, worker_id, traceback.format_exc())
+    else:
+        queue.complete(job.job_id, worker_id, result)
+    finally:
+        stop.set()
+        heartbeat.join()
+    logger.info(
+        f"Worker {worker_id} finished job {job.job_id} "
+        f"(RSS {current_rss_bytes() / MB:.0f} MB)"
+    )
+    return True
+
+
+def run_worker(
+    db_file: str,
+    worker_id: str | None = None,
+    poll_interval: float = 1.0,
+    max_jobs: int | None = None,
+    memory_budget_mb: float | None = None,
+    memory_timeout: float = 60,
+) -> None:
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = JobQueue(db_file)
+    workflow = create_extraction_workflow()
+    handlers = {EXTRACT_PAGE_JOB: extract_page_handler(workflow)}
+    # Stop claiming new pages while the worker is over its memory budget, dropping
+    # the workflow's idle agents to get back under it
+    budget = MemoryBudget(
+        memory_budget_mb,
+        poll_interval=poll_interval,
+        timeout=memory_timeout,
+        on_over_budget=workflow.release_idle_agents,
+    )
+
+    release_memory()
+    if budget.is_over_budget():
+        logger.error(
+            f"Worker {worker_id} exiting, its memory budget of {memory_budget_mb:.0f} "
+            f"MB is below its RSS on startup ({current_rss_bytes() / MB:.0f} MB)"
+        )
+        sys.exit(EXIT_MEMORY_BUDGET_TOO_LOW)
+
+    logger.info(f"Worker {worker_id} polling {db_file}")
+    n_jobs = 0
+    while max_jobs is None or n_jobs < max_jobs:
+        if not budget.wait_for_capacity():
+            # Memory the worker cannot release (e.g. fragmentation or a leak) is
+            # only reclaimed by restarting the process, which is left to a supervisor
+            logger.error(f"Worker {worker_id} exiting, still over its memory budget")
+            sys.exit(1)
+        if process_next_job(queue, worker_id, handlers):
+            n_jobs += 1
+        else:
+            time.sleep(poll_interval)
+
+
+def run_workers(
+    workers: int = typer.Option(1, help="Number of worker processes to start"),
+    db_file: str = typer.Option(
+        app_settings.JOB_QUEUE_DB_FILE, help="Path to the shared job queue file"
+    ),
+    poll_interval: float = typer.Option(1.0, help="Seconds to wait when idle"),
+    memory_budget_mb: float | None = typer.Option(
+        app_settings.WORKER_MEMORY_BUDGET_MB,
+        help=(
+            "Pause claiming jobs while a worker's RSS exceeds this many MB, "
+            "restarting the worker if it stays above it"
+        ),
+    ),
+    max_restarts: int = typer.Option(
+        5,
+        help=(
+            "Stop restarting a worker after this many failures in a row, without "
+            "it staying up for min_uptime seconds in between"
+        ),
+    ),
+    restart_backoff: float = typer.Option(
+        1.0, help="Seconds to wait before restarting a worker, doubled per failure"
+    ),
+    min_uptime: float = typer.Option(
+        300, help="Seconds a worker must run for its failure count to be reset"
+    ),
+):
+    def start_worker(n_failures: int = 0) -> None:
+        process = Process(
+            target=run_worker,
+            args=(db_file,),
+            kwargs={
+                "poll_interval": poll_interval,
+                "memory_budget_mb": memory_budget_mb,
+            },
+        )
+        process.start()
+        processes[process] = (time.monotonic(), n_failures)
+
+    # Each running worker with its start time and its failures in a row, and the
+    # failure counts of the workers waiting to be restarted, by restart time
+    processes: dict[Process, tuple[float, int]] = {}
+    restarts: list[tuple[float, int]] = []
+    for _ in range(workers):
+        start_worker()
+
+    n_given_up = 0
+    while processes or restarts:
+        for process in list(processes):
+            process.join(timeout=poll_interval / max(len(processes), 1))
+        now = time.monotonic()
+        for process in [process for process in processes if not process.is_alive()]:
+            started, n_failures = processes.pop(process)
+            if process.exitcode == 0:
+                continue
+            if process.exitcode == EXIT_MEMORY_BUDGET_TOO_LOW:
+                # Every restart would fail the same way
+                for other in processes:
+                    other.terminate()
+                raise typer.BadParameter(
+                    f"The memory budget of {memory_budget_mb} MB is below the "
+                    "RSS of a freshly started worker",
+                    param_hint="--memory-budget-mb",
+                )
+
+            # Workers exit with an error when they cannot get back under their
+            # memory budget, and are replaced by a fresh process. Workers which
+            # keep failing soon after starting are restarted with a backoff, and
+            # given up on after max_restarts
+            n_failures = 1 if now - started >= min_uptime else n_failures + 1
+            if n_failures > max_restarts:
+                logger.error(
+                    f"Worker process {process.pid} exited with code "
+                    f"{process.exitcode}, after {max_restarts} restarts in a row, "
+                    "not restarting it"
+                )
+                n_given_up += 1
+                continue
+            delay = restart_backoff * 2 ** (n_failures - 1)
+            logger.warning(
+                f"Worker process {process.pid} exited with code {process.exitcode}, "
+                f"restarting it in {delay:.0f}s"
+            )
+            restarts.append((now + delay, n_failures))
+
+        for restart in [restart for restart in restarts if restart[0] <= now]:
+            restarts.remove(restart)
+            start_worker(restart[1])
+        if restarts and not processes:
+            time.sleep(max(min(restarts)[0] - now, 0))
+
+    if n_given_up:
+        raise typer.Exit(1)
+
+
+def main():
+    typer.run(run_workers)
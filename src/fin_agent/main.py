@@ -1,19 +1,27 @@
 from agno.playground import Playground, serve_playground_app
 
 from fin_agent.settings import app_settings
-from fin_agent.agents.action_generation.action_planner import action_planner
-from fin_agent.agents.document_parser.bbox_generator import bbox_generator
+from fin_agent.agents.action_generation.action_planner import (
+    create_action_planner,
+    create_action_planner_advanced,
+)
+from fin_agent.agents.document_parser.bbox_inspector import create_bbox_inspector
+from fin_agent.agents.pool import PooledAgent
+from fin_agent.jobs.api import router as jobs_router
 from fin_agent.workflows.extract_document_context import PdfContextExtractionWorkflow
 
+# The Playground runs its agents directly, so each run is served by a pooled agent
 app = Playground(
     agents=[
-        action_planner,
-        bbox_generator,
+        PooledAgent(create_action_planner),
+        PooledAgent(create_action_planner_advanced),
+        PooledAgent(create_bbox_inspector),
     ],
     workflows=[
         PdfContextExtractionWorkflow(),
     ],
 ).get_app(use_async=True)
+app.include_router(jobs_router)
 
 
 def run_playground():
@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     ENVIRONMENT: Literal["development", "production"]
     RELOAD_ENABLED: bool
     GROQ_API_KEY: str
+    PAGE_STORE_DB_FILE: str = "/tmp/fin_agent_pages.db"
+    PAGE_STORE_MAX_AGE_DAYS: float | None = 90
+    PAGE_STORE_MAX_MB: float | None = 1024
+    JOB_QUEUE_DB_FILE: str = "/tmp/fin_agent_jobs.db"
+    WORKER_MEMORY_BUDGET_MB: float | None = None
 
 
 app_settings = Settings()
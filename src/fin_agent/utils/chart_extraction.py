@@ -0,0 +1,263 @@
+import re
+from collections import defaultdict
+
+import pymupdf
+from pydantic import BaseModel
+from pymupdf import Point, Rect
+from tabulate import tabulate
+
+from fin_agent.agents.document_parser.models import BoundingBox
+from fin_agent.utils.document_parsing import convert_relative_to_absolute_coordinates
+
+NUMBER_PATTERN = re.compile(r"^\(?-?[$€£]?\d[\d,]*(\.\d+)?%?\)?$")
+
+# Distances (in points) within which shapes and labels are considered aligned
+ALIGNMENT_TOLERANCE = 3
+# Filled rectangles at most this size (in points) are treated as legend swatches
+LEGEND_SWATCH_SIZE = 12
+
+
+class ChartData(BaseModel):
+    """Data recovered from a vector chart, with one value per series and x label."""
+
+    chart_type: str
+    x_labels: list[str]
+    series: dict[str, list[float | None]]
+
+    def to_markdown(self) -> str:
+        rows = [
+            [label, *(values[i] for values in self.series.values())]
+            for i, label in enumerate(self.x_labels)
+        ]
+        return tabulate(rows, headers=["", *self.series], tablefmt="pipe")
+
+
+def _parse_number(text: str) -> float | None:
+    text = text.strip()
+    if not NUMBER_PATTERN.match(text):
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    value = float(re.sub(r"[^\d.\-]", "", text))
+    return -value if negative else value
+
+
+def _text_spans(page: pymupdf.Page, clip: Rect) -> list[tuple[str, Rect]]:
+    spans = []
+    for block in page.get_text("dict", clip=clip)["blocks"]:
+        for line in block.get("lines", []):
+            for span in line["spans"]:
+                if span["text"].strip():
+                    spans.append((span["text"].strip(), Rect(span["bbox"])))
+    return spans
+
+
+def _shapes(
+    page: pymupdf.Page, clip: Rect
+) -> tuple[list[tuple[Rect, tuple]], list[list[Point]]]:
+    """
+    Collect the filled rectangles (with their fill colour) and the stroked
+    polylines which are not purely horizontal or vertical (i.e. not axes, ticks
+    or gridlines) inside the clip.
+    """
+    rects = []
+    polylines = []
+    for drawing in page.get_drawings():
+        if not clip.intersects(drawing["rect"]):
+            continue
+
+        if drawing["fill"] is not None:
+            for item in drawing["items"]:
+                if item[0] == "re":
+                    rect = Rect(item[1])
+                elif item[0] == "qu":
+                    rect = item[1].rect
+                else:
+                    continue
+                # Skip backgrounds spanning the whole plot
+                if rect in clip and rect.get_area() < 0.5 * clip.get_area():
+                    rects.append((rect, tuple(round(c, 2) for c in drawing["fill"])))
+
+        if drawing["color"] is not None:
+            points = []
+            for item in drawing["items"]:
+                if item[0] != "l":
+                    continue
+                start, end = item[1], item[2]
+                if points and abs(points[-1] - start) > ALIGNMENT_TOLERANCE:
+                    polylines.append(points)
+                    points = []
+                if not points:
+                    points.append(start)
+                points.append(end)
+            if points:
+                polylines.append(points)
+
+    polylines = [
+        points
+        for points in polylines
+        if len(points) >= 3
+        and all(p in clip for p in points)
+        and any(
+            abs(a.x - b.x) > ALIGNMENT_TOLERANCE
+            and abs(a.y - b.y) > ALIGNMENT_TOLERANCE
+            for a, b in zip(points, points[1:])
+        )
+    ]
+    return rects, polylines
+
+
+def _stacked_bars(bars: list[tuple[Rect, tuple]]) -> set[int]:
+    """
+    The indices of the bars which are segments of a stacked bar, i.e. share their
+    x span with another bar and butt against it vertically.
+    """
+    stacked = set()
+    for i, (a, _) in enumerate(bars):
+        for j, (b, _) in enumerate(bars[i + 1 :], start=i + 1):
+            if (
+                abs(a.x0 - b.x0) <= ALIGNMENT_TOLERANCE
+                and abs(a.x1 - b.x1) <= ALIGNMENT_TOLERANCE
+                and (
+                    abs(a.y1 - b.y0) <= ALIGNMENT_TOLERANCE
+                    or abs(b.y1 - a.y0) <= ALIGNMENT_TOLERANCE
+                )
+            ):
+                stacked |= {i, j}
+    return stacked
+
+
+def _fit_axis(ticks: list[tuple[float, float]]) -> tuple[float, float] | None:
+    """Least squares fit of value = slope * y + intercept through the axis ticks."""
+    if len({y for y, _ in ticks}) < 2:
+        return None
+    n = len(ticks)
+    mean_y = sum(y for y, _ in ticks) / n
+    mean_v = sum(v for _, v in ticks) / n
+    covariance = sum((y - mean_y) * (v - mean_v) for y, v in ticks)
+    variance = sum((y - mean_y) ** 2 for y, _ in ticks)
+    slope = covariance / variance
+    intercept = mean_v - slope * mean_y
+
+    # Tick labels should sit on the fitted line, otherwise they are not an axis
+    span = max(v for _, v in ticks) - min(v for _, v in ticks)
+    if span == 0 or any(abs(slope * y + intercept - v) > 0.02 * span for y, v in ticks):
+        return None
+    return slope, intercept
+
+
+def extract_chart_data(
+    page: pymupdf.Page, bounding_box: BoundingBox | None = None
+) -> ChartData | None:
+    """
+    Recover the data behind a vertical bar or line chart drawn with vector graphics.
+
+    Bars are the filled rectangles and lines are the stroked polylines within the
+    bounding box. Values are read off a linear y axis fitted through the numeric
+    labels to the left of the plot (the segments of stacked bars by their height), and each bar or line point is matched to the
+    nearest label on the first line of text below the plot. Series are named from
+    legend entries (a small swatch followed by text) where present.
+
+    Args:
+        page (pymupdf.Page): The PDF page containing the chart
+        bounding_box (BoundingBox | None, optional): The chart section of the page.
+            If None, the entire page is used. Defaults to None.
+
+    Returns:
+        ChartData | None: The chart data, or None if the chart could not be recovered
+            from vector drawings (e.g. it is a raster image)
+    """
+    clip = convert_relative_to_absolute_coordinates(bounding_box, page.rect)
+    rects, polylines = _shapes(page, clip)
+    spans = _text_spans(page, clip)
+
+    legend = {}
+    legend_spans = []
+    bars = []
+    for rect, colour in rects:
+        if rect.width <= LEGEND_SWATCH_SIZE and rect.height <= LEGEND_SWATCH_SIZE:
+            labels = [
+                (text, span)
+                for text, span in spans
+                if 0 <= span.x0 - rect.x1 <= 3 * LEGEND_SWATCH_SIZE
+                and abs((span.y0 + span.y1) / 2 - (rect.y0 + rect.y1) / 2)
+                <= ALIGNMENT_TOLERANCE * 2
+            ]
+            if labels:
+                text, span = min(labels, key=lambda label: label[1].x0)
+                legend[colour] = text
+                legend_spans.append(span)
+                continue
+        bars.append((rect, colour))
+
+    points = [point for polyline in polylines for point in polyline]
+    if not bars and not points:
+        return None
+
+    plot = Rect(bars[0][0]) if bars else Rect(points[0], points[0])
+    for rect, _ in bars:
+        plot |= rect
+    for point in points:
+        plot |= point
+
+    y_ticks = [
+        ((span.y0 + span.y1) / 2, value)
+        for text, span in spans
+        if span.x1 <= plot.x0 + ALIGNMENT_TOLERANCE
+        and (value := _parse_number(text)) is not None
+    ]
+    axis = _fit_axis(y_ticks)
+    if axis is None:
+        return None
+    slope, intercept = axis
+
+    below_plot = [
+        (text, span)
+        for text, span in spans
+        if span.y0 >= plot.y1 - ALIGNMENT_TOLERANCE
+        and span.x1 > plot.x0 - ALIGNMENT_TOLERANCE
+        and span not in legend_spans
+    ]
+    if not below_plot:
+        return None
+    # The x labels are the first line of text below the plot, rather than e.g. an
+    # axis title or a source note further down
+    first_line = min((span for _, span in below_plot), key=lambda span: span.y0)
+    x_labels = sorted(
+        (
+            (text, span)
+            for text, span in below_plot
+            if abs((span.y0 + span.y1) / 2 - (first_line.y0 + first_line.y1) / 2)
+            <= first_line.height / 2
+        ),
+        key=lambda label: label[1].x0,
+    )
+
+    def nearest_label(x: float) -> int:
+        return min(
+            range(len(x_labels)),
+            key=lambda i: abs((x_labels[i][1].x0 + x_labels[i][1].x1) / 2 - x),
+        )
+
+    def value_at(y: float) -> float:
+        return round(slope * y + intercept, 2)
+
+    stacked = _stacked_bars(bars)
+    series: dict[str, list[float | None]] = defaultdict(lambda: [None] * len(x_labels))
+    for i, (rect, colour) in enumerate(bars):
+        if colour not in legend:
+            legend[colour] = f"series_{len(series) + 1}"
+        top, bottom = value_at(rect.y0), value_at(rect.y1)
+        # Bars grow away from the zero line, in either direction. The far end of a
+        # stacked segment is the running total, so its value is its height
+        far, near = (top, bottom) if abs(top) >= abs(bottom) else (bottom, top)
+        value = round(far - near, 2) if i in stacked else far
+        series[legend[colour]][nearest_label((rect.x0 + rect.x1) / 2)] = value
+    for i, polyline in enumerate(polylines):
+        for point in polyline:
+            series[f"line_{i + 1}"][nearest_label(point.x)] = value_at(point.y)
+
+    return ChartData(
+        chart_type=("stacked_bar" if stacked else "bar") if bars else "line",
+        x_labels=[text for text, _ in x_labels],
+        series=dict(series),
+    )
@@ -1,15 +1,18 @@
 import base64
+from contextlib import contextmanager
 from io import BytesIO
+from typing import Iterator
 
 import httpx
-import PIL
+import PIL.Image
 import pymupdf
 import tabula
 from agno.media import Image
 
-from pymupdf import Rect
+from pymupdf import Point, Rect
 
 from fin_agent.agents.document_parser.models import BoundingBox
+from fin_agent.utils.financial_tables import FinancialTable
 
 
 def convert_relative_to_absolute_coordinates(
@@ -40,13 +43,26 @@ def convert_relative_to_absolute_coordinates(
     return Rect(x0=x0, y0=y0, x1=x1, y1=y1)
 
 
-def retrieve_pdf_page(pdf_url: str, page_number: int) -> pymupdf.Page:
+@contextmanager
+def open_pdf_page(pdf_url: str, page_number: int) -> Iterator[pymupdf.Page]:
+    """
+    Download a PDF and open one of its pages. The page and its parent document
+    are only valid inside the context, and are closed on exit so that the PDF
+    bytes and MuPDF resources are released as soon as the page is processed.
+
+    Args:
+        pdf_url (str): URL of the PDF document
+        page_number (int): 0-indexed page number
+
+    Yields:
+        pymupdf.Page: The requested page
+    """
     with httpx.Client() as client:
         response = client.get(pdf_url)
         response.raise_for_status()
-        pdf_bytes = response.content
-        pdf_document = pymupdf.open(stream=BytesIO(pdf_bytes), filetype="pdf")
-        return pdf_document.load_page(page_number)
+
+    with pymupdf.open(stream=response.content, filetype="pdf") as pdf_document:
+        yield pdf_document.load_page(page_number)
 
 
 def crop_image(
@@ -63,22 +79,23 @@ def crop_image(
         y_max=image_height / 100 * bounding_box.y_max,
     )
     if image.filepath:
-        pil_image = PIL.Image.open(image.filepath)
+        source = image.filepath
     elif image.content:
-        pil_image = PIL.Image.open(BytesIO(image.content))
+        source = BytesIO(image.content)
     else:
         raise ValueError("Image must have a filepath or content")
 
-    cropped_image = pil_image.crop(
-        (
-            absolute_coordinates["x_min"],
-            absolute_coordinates["y_min"],
-            absolute_coordinates["x_max"],
-            absolute_coordinates["y_max"],
-        )
-    )
     buffer = BytesIO()
-    cropped_image.save(buffer, format="PNG")
+    with PIL.Image.open(source) as pil_image:
+        with pil_image.crop(
+            (
+                absolute_coordinates["x_min"],
+                absolute_coordinates["y_min"],
+                absolute_coordinates["x_max"],
+                absolute_coordinates["y_max"],
+            )
+        ) as cropped_image:
+            cropped_image.save(buffer, format="PNG")
     return Image(content=buffer.getvalue())
 
 
@@ -87,10 +104,8 @@ def image_from_pdf_page(
 ) -> bytes:
     extents = convert_relative_to_absolute_coordinates(bounding_box, page.rect)
 
-    img = page.get_pixmap(clip=extents).pil_image()
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    return buffer.getvalue()
+    # Encode straight from the pixmap, avoiding an intermediate PIL image
+    return page.get_pixmap(clip=extents).tobytes("png")
 
 
 def b64_str_from_pdf_page(
@@ -107,13 +122,7 @@ def b64_str_from_pdf_page(
     Returns:
         str: Base64 encoded PNG image
     """
-    extents = convert_relative_to_absolute_coordinates(bounding_box, page.rect)
-
-    img = page.get_pixmap(clip=extents).pil_image()
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    img_bytes = buffer.getvalue()
-    return base64.b64encode(img_bytes).decode("utf-8")
+    return base64.b64encode(image_from_pdf_page(page, bounding_box)).decode("utf-8")
 
 
 def image_from_b64_str(b64_str: str) -> Image:
@@ -126,17 +135,31 @@ def b64_str_from_image(image: Image) -> str:
 
 
 def extract_text_from_pdf_page(
-    page: pymupdf.Page, bounding_box: BoundingBox | None = None
+    page: pymupdf.Page,
+    bounding_box: BoundingBox | None = None,
+    exclude: list[Rect] | None = None,
 ) -> str:
     extents = convert_relative_to_absolute_coordinates(bounding_box, page.rect)
-    return page.get_text(clip=extents)
+    if not exclude:
+        return page.get_text(clip=extents)
 
+    # Lines centred in an excluded area (e.g. a table passed on separately) are
+    # left out
+    text = ""
+    for block in page.get_text("dict", clip=extents)["blocks"]:
+        for line in block.get("lines", []):
+            x0, y0, x1, y1 = line["bbox"]
+            if not any(Point((x0 + x1) / 2, (y0 + y1) / 2) in area for area in exclude):
+                text += "".join(span["text"] for span in line["spans"]) + "\n"
+    return text
 
-def extract_tables_from_pdf(
+
+def _read_tables(
     pdf_url: str,
     page_number: int,
     bounding_box: BoundingBox | None = None,
-) -> list[str]:
+    output_format: str = "dataframe",
+) -> list:
     if bounding_box is None:
         area = [0, 0, 100, 100]
     else:
@@ -147,11 +170,41 @@ def extract_tables_from_pdf(
             bounding_box.x_max,
         ]
 
-    frames = tabula.read_pdf(
+    return tabula.read_pdf(
         pdf_url,
         pages=page_number,
         area=area,
         relative_area=True,
+        output_format=output_format,
         pandas_options={"header": None},
     )
-    return [f.to_markdown() for f in frames]
+
+
+def extract_tables_from_pdf(
+    pdf_url: str,
+    page_number: int,
+    bounding_box: BoundingBox | None = None,
+) -> list[str]:
+    return [f.to_markdown() for f in _read_tables(pdf_url, page_number, bounding_box)]
+
+
+def extract_financial_tables_from_pdf(
+    pdf_url: str,
+    page_number: int,
+    bounding_box: BoundingBox | None = None,
+) -> list[tuple[FinancialTable, Rect]]:
+    """
+    Extract the tables on a page as typed frames with normalised numeric cells,
+    named table_1, table_2, ... in the order tabula finds them.
+
+    Returns:
+        list[tuple[FinancialTable, Rect]]: Each table with its area of the page
+    """
+    tables = []
+    for i, table in enumerate(
+        _read_tables(pdf_url, page_number, bounding_box, output_format="json")
+    ):
+        rows = [[cell["text"] for cell in row] for row in table["data"]]
+        area = Rect(table["left"], table["top"], table["right"], table["bottom"])
+        tables.append((FinancialTable.from_rows(f"table_{i + 1}", rows), area))
+    return tables
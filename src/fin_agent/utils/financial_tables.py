@@ -0,0 +1,201 @@
+import re
+
+import polars as pl
+
+ROW_HEADER = "row"
+
+# Cells which mark a value as absent (or nil) rather than holding a number
+EMPTY_CELLS = {"", "-", "—", "–", "n/a", "na", "nm", "none"}
+SCALES = {
+    "thousand": 1e3,
+    "thousands": 1e3,
+    "k": 1e3,
+    "million": 1e6,
+    "millions": 1e6,
+    "mm": 1e6,
+    "m": 1e6,
+    "billion": 1e9,
+    "billions": 1e9,
+    "bn": 1e9,
+    "b": 1e9,
+}
+CURRENCIES = {"$": "$", "€": "€", "£": "£", "usd": "$", "eur": "€", "gbp": "£"}
+
+NUMBER_PATTERN = re.compile(
+    r"^(?P<currency>[$€£]|usd|eur|gbp)?\s*(?P<sign>-)?\s*(?P<currency_after_sign>[$€£])?\s*"
+    r"(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)\s*"
+    r"(?P<scale>thousands?|millions?|billions?|bn|mm|[kmb])?\s*(?P<percent>%)?$"
+)
+
+
+def parse_financial_value(text: str) -> tuple[float | None, str | None]:
+    """
+    Normalise a numeric cell from a financial table, e.g.
+
+    - "(1,234)" -> (-1234.0, None), as accounts write negatives in parentheses
+    - "$ 1.5 million" -> (1500000.0, "$")
+    - "12.5 %" -> (12.5, "%")
+
+    Returns:
+        tuple[float | None, str | None]: The value and its unit ("%" or a currency),
+            or (None, None) if the cell is not a number
+    """
+    text = " ".join(text.lower().split())
+    if text in EMPTY_CELLS:
+        return None, None
+
+    # Negatives are written in parentheses, which may also enclose the currency or
+    # unit, e.g. "(1,234)", "$ (1,234)" or "(3.2)%"
+    negative = text.count("(") == text.count(")") == 1 and text.index("(") < text.index(
+        ")"
+    )
+    if negative:
+        text = " ".join(text.replace("(", " ").replace(")", " ").split())
+
+    match = NUMBER_PATTERN.match(text)
+    if match is None:
+        return None, None
+
+    value = float(match["number"].replace(",", ""))
+    if match["scale"]:
+        value *= SCALES[match["scale"]]
+    if negative != bool(match["sign"]):
+        value = -value
+
+    currency = match["currency"] or match["currency_after_sign"]
+    unit = "%" if match["percent"] else CURRENCIES.get(currency) if currency else None
+    return value, unit
+
+
+def _normalise_header(text: str) -> str:
+    return " ".join(text.lower().replace(":", " ").split())
+
+
+def _unique_headers(headers: list[str]) -> list[str]:
+    unique = []
+    for header in headers:
+        header = " ".join(header.split())
+        name, n = header, 1
+        while name in unique:
+            n += 1
+            name = f"{header} ({n})"
+        unique.append(name)
+    return unique
+
+
+class FinancialTable:
+    """
+    A table of a financial report as a typed polars frame.
+
+    The first row of the source table holds the column headers and the first
+    column the row headers (stored in the `row` column). Columns whose cells are
+    all numbers are normalised to Float64, with the unit of each cell kept
+    alongside. Other columns keep their text. The source cells are kept in `rows`,
+    so the table can be stored as JSON and rebuilt with `from_rows`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        frame: pl.DataFrame,
+        units: dict[tuple[str, str], str],
+        rows: list[list[str]],
+    ):
+        self.name = name
+        self.frame = frame
+        self.units = units
+        self.rows = rows
+
+    @classmethod
+    def from_rows(cls, name: str, rows: list[list[str]]) -> "FinancialTable":
+        """Build a table from its cells, e.g. a ConvFinQA table or tabula output."""
+        rows = [
+            [str(cell) for cell in row]
+            for row in rows
+            if any(str(c).strip() for c in row)
+        ]
+        if not rows:
+            return cls(name, pl.DataFrame(schema={ROW_HEADER: pl.String}), {}, [])
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+
+        header, *body = rows
+        columns = _unique_headers([header[i] or f"column {i}" for i in range(1, width)])
+        row_headers = _unique_headers(
+            [row[0] or f"row {i}" for i, row in enumerate(body)]
+        )
+
+        data: dict[str, pl.Series] = {
+            ROW_HEADER: pl.Series(ROW_HEADER, row_headers, dtype=pl.String)
+        }
+        units = {}
+        for i, column in enumerate(columns, start=1):
+            cells = [row[i] for row in body]
+            parsed = [parse_financial_value(cell) for cell in cells]
+            is_numeric = all(
+                value is not None or _normalise_header(cell) in EMPTY_CELLS
+                for cell, (value, _) in zip(cells, parsed)
+            )
+            if is_numeric:
+                data[column] = pl.Series(
+                    column, [value for value, _ in parsed], dtype=pl.Float64
+                )
+                units |= {
+                    (row_header, column): unit
+                    for row_header, (_, unit) in zip(row_headers, parsed)
+                    if unit is not None
+                }
+            else:
+                data[column] = pl.Series(column, cells, dtype=pl.String)
+
+        return cls(name, pl.DataFrame(data), units, rows)
+
+    @property
+    def columns(self) -> list[str]:
+        return self.frame.columns[1:]
+
+    @property
+    def row_headers(self) -> list[str]:
+        return self.frame[ROW_HEADER].to_list()
+
+    def schema(self) -> str:
+        """A compact description of the table: its headers and dimensions, but no values."""
+        return "\n".join(
+            [
+                f"{self.name}: {self.frame.height} rows x {len(self.columns)} columns",
+                f"  columns: {' | '.join(self.columns)}",
+                f"  rows: {' | '.join(self.row_headers)}",
+            ]
+        )
+
+    @staticmethod
+    def _match(query: str, headers: list[str], kind: str) -> str:
+        query = _normalise_header(query)
+        normalised = {header: _normalise_header(header) for header in headers}
+        matches = [h for h, n in normalised.items() if n == query]
+        if not matches:
+            matches = [h for h, n in normalised.items() if query and query in n]
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            raise KeyError(f"No {kind} matches '{query}', choose from: {headers}")
+        raise KeyError(f"Several {kind}s match '{query}', choose from: {matches}")
+
+    def lookup(self, row: str, column: str) -> dict[str, str | float | None]:
+        """
+        Look up a cell by its row and column headers. Headers are matched ignoring
+        case and whitespace, falling back to a unique partial match.
+
+        Raises:
+            KeyError: If the row or column does not match exactly one header
+        """
+        row = self._match(row, self.row_headers, "row")
+        column = self._match(column, self.columns, "column")
+        value = self.frame.row(self.row_headers.index(row), named=True)[column]
+        return {
+            "table": self.name,
+            "row": row,
+            "column": column,
+            "value": value,
+            "unit": self.units.get((row, column)),
+        }
@@ -0,0 +1,114 @@
+import ctypes
+import ctypes.util
+import gc
+import os
+import resource
+import sys
+import time
+from typing import Callable
+
+import pymupdf
+from agno.utils.log import logger
+
+MB = 1024 * 1024
+
+
+def current_rss_bytes() -> int:
+    """
+    Return the resident set size of the current process in bytes.
+
+    On platforms without /proc the peak RSS is returned instead.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "malloc_trim") else None
+
+
+_libc = _load_libc()
+
+
+def release_memory() -> None:
+    """
+    Drop unreachable objects, empty the MuPDF resource store and, on glibc,
+    return freed heap pages to the operating system.
+    """
+    gc.collect()
+    pymupdf.TOOLS.store_shrink(100)
+    if _libc is not None:
+        _libc.malloc_trim(0)
+
+
+class MemoryBudget:
+    """
+    A per-process memory budget used to apply backpressure.
+
+    Callers check the budget before accepting new work. When the process RSS is
+    above the budget, cached memory is released (on_over_budget is called first,
+    so callers can drop their own caches) and the caller is paused until the RSS
+    drops back below the budget (or the timeout is reached).
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float | None,
+        poll_interval: float = 0.5,
+        timeout: float | None = None,
+        on_over_budget: Callable[[], None] | None = None,
+    ):
+        self.max_rss_bytes = None if max_rss_mb is None else int(max_rss_mb * MB)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.on_over_budget = on_over_budget
+
+    def _release(self) -> None:
+        if self.on_over_budget is not None:
+            self.on_over_budget()
+        release_memory()
+
+    def is_over_budget(self) -> bool:
+        return (
+            self.max_rss_bytes is not None and current_rss_bytes() > self.max_rss_bytes
+        )
+
+    def wait_for_capacity(self) -> bool:
+        """
+        Block until the process is within its memory budget.
+
+        Returns:
+            bool: True if the process is within budget, False if the timeout was reached
+        """
+        if not self.is_over_budget():
+            return True
+
+        self._release()
+        started = time.monotonic()
+        while self.is_over_budget():
+            if self.timeout is not None and time.monotonic() - started >= self.timeout:
+                logger.warning(
+                    f"Memory budget of {self.max_rss_bytes / MB:.0f} MB still exceeded "
+                    f"after {self.timeout:.0f}s (RSS {current_rss_bytes() / MB:.0f} MB)"
+                )
+                return False
+            logger.info(
+                f"Over memory budget (RSS {current_rss_bytes() / MB:.0f} MB > "
+                f"{self.max_rss_bytes / MB:.0f} MB), pausing"
+            )
+            time.sleep(self.poll_interval)
+            self._release()
+        return True
@@ -0,0 +1,62 @@
+import hashlib
+
+import pymupdf
+
+
+def _font_digest(document: pymupdf.Document, font: tuple) -> bytes:
+    xref, ext, font_type, basefont, _, encoding = font[:6]
+    digest = hashlib.sha256(f"{basefont}|{font_type}|{ext}|{encoding}".encode("utf-8"))
+    if xref and ext != "n/a":
+        # Embedded font, hash the font program itself
+        _, _, _, buffer = document.extract_font(xref)
+        digest.update(buffer or b"")
+    return digest.digest()
+
+
+def _image_digest(document: pymupdf.Document, image: tuple) -> bytes:
+    xref, smask, width, height, bpc, colorspace = image[:6]
+    digest = hashlib.sha256(f"{width}x{height}|{bpc}|{colorspace}".encode("utf-8"))
+    digest.update(document.xref_stream_raw(xref) or b"")
+    if smask:
+        digest.update(document.xref_stream_raw(smask) or b"")
+    return digest.digest()
+
+
+def fingerprint_pdf_page(page: pymupdf.Page) -> str:
+    """
+    Generate a content fingerprint for a PDF page.
+
+    The fingerprint is built from the page content stream, the fonts and the images
+    referenced by the page, so it is independent of the document the page belongs to
+    and of its position within that document. Two pages with the same fingerprint
+    render identically and can share extraction results.
+
+    Args:
+        page (pymupdf.Page): The PDF page to fingerprint
+
+    Returns:
+        str: A hex encoded SHA-256 digest of the page content
+    """
+    document = page.parent
+    digest = hashlib.sha256()
+
+    rect = page.rect
+    digest.update(f"{rect.width:.2f}x{rect.height:.2f}|{page.rotation}".encode("utf-8"))
+    digest.update(page.read_contents())
+
+    # Resource xrefs differ between documents, so only the resource name (as
+    # referenced by the content stream) and the resource content are hashed
+    for font in sorted(page.get_fonts(full=True), key=lambda f: f[4]):
+        digest.update(font[4].encode("utf-8"))
+        digest.update(_font_digest(document, font))
+
+    for image in sorted(page.get_images(full=True), key=lambda i: i[7]):
+        digest.update(image[7].encode("utf-8"))
+        digest.update(_image_digest(document, image))
+
+    # Form XObjects carry their own content streams (often charts and logos)
+    for xref, name, _, _ in sorted(page.get_xobjects(), key=lambda x: x[1]):
+        digest.update(name.encode("utf-8"))
+        digest.update(document.xref_stream(xref) or b"")
+
+    return digest.hexdigest()
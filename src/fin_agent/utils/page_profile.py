@@ -0,0 +1,162 @@
+from collections import defaultdict
+from typing import Literal
+
+import pymupdf
+from pydantic import BaseModel
+from pymupdf import Rect
+
+from fin_agent.utils.chart_extraction import NUMBER_PATTERN
+
+PageRoute = Literal["text_only", "table", "vision"]
+
+# Line segments thinner than this (in points) in one direction are rulings
+RULING_THICKNESS = 2
+# Pages with at least this many horizontal rulings per 100pt of height are tables
+TABLE_RULING_DENSITY = 1.5
+# Pages where at least this fraction of text rows hold several numbers in columns
+# are tables, which catches tables laid out with whitespace rather than rulings
+TABLE_NUMERIC_ROW_RATIO = 0.3
+# Distance (in points) within which numbers in neighbouring rows share a column
+COLUMN_TOLERANCE = 3
+# Pages with more image coverage than this are treated as scanned
+SCANNED_IMAGE_COVERAGE = 0.5
+# Pages with more image coverage than this contain figures (rather than e.g. logos)
+FIGURE_IMAGE_COVERAGE = 0.05
+# Pages with at least this many non-ruling shapes are treated as containing graphics
+GRAPHIC_SHAPE_COUNT = 3
+
+
+class PageProfile(BaseModel):
+    """Cheap layout features of a PDF page, used to route it to a pipeline."""
+
+    has_text_layer: bool
+    text_coverage: float
+    image_coverage: float
+    n_drawings: int
+    n_lines: int
+    n_graphic_shapes: int
+    ruling_density: float
+    numeric_row_ratio: float
+
+
+def _coverage(rects: list[Rect], page_rect: Rect) -> float:
+    area = sum((rect & page_rect).get_area() for rect in rects)
+    return min(area / page_rect.get_area(), 1.0)
+
+
+def _numeric_row_ratio(page: pymupdf.Page) -> float:
+    """
+    The fraction of text rows containing at least two numbers which line up (by
+    their left or right edge) with numbers in a neighbouring row. Prose quoting
+    amounts and years has rows with several numbers too, but they do not line up
+    in columns.
+    """
+    rows = defaultdict(list)
+    for word in page.get_text("words"):
+        # Words sharing a baseline belong to the same row, even across blocks
+        numbers = rows[round(word[3] / 2)]
+        if NUMBER_PATTERN.match(word[4]):
+            numbers.append((word[0], word[2]))
+    if not rows:
+        return 0.0
+
+    def n_aligned(numbers: list[tuple[float, float]], other: list) -> int:
+        return sum(
+            any(
+                abs(x0 - other_x0) <= COLUMN_TOLERANCE
+                or abs(x1 - other_x1) <= COLUMN_TOLERANCE
+                for other_x0, other_x1 in other
+            )
+            for x0, x1 in numbers
+        )
+
+    rows = [rows[key] for key in sorted(rows)]
+    n_numeric_rows = sum(
+        any(
+            n_aligned(numbers, rows[j]) >= 2
+            for j in (i - 1, i + 1)
+            if 0 <= j < len(rows)
+        )
+        for i, numbers in enumerate(rows)
+    )
+    return n_numeric_rows / len(rows)
+
+
+def profile_pdf_page(page: pymupdf.Page) -> PageProfile:
+    """
+    Profile the layout of a PDF page from its text blocks, images and vector
+    drawings, without rendering it.
+
+    Args:
+        page (pymupdf.Page): The PDF page to profile
+
+    Returns:
+        PageProfile: The layout features of the page
+    """
+    page_rect = page.rect
+    text_blocks = [
+        Rect(block[:4]) for block in page.get_text("blocks") if block[6] == 0
+    ]
+    image_rects = [Rect(image["bbox"]) for image in page.get_image_info()]
+
+    drawings = page.get_drawings()
+    n_lines = 0
+    n_horizontal_rulings = 0
+    n_graphic_shapes = 0
+    for drawing in drawings:
+        for item in drawing["items"]:
+            if item[0] == "l":
+                n_lines += 1
+                start, end = item[1], item[2]
+                if abs(start.y - end.y) <= RULING_THICKNESS:
+                    n_horizontal_rulings += 1
+                elif abs(start.x - end.x) > RULING_THICKNESS:
+                    # Diagonal segments are drawn by line charts, not tables
+                    n_graphic_shapes += 1
+            elif item[0] in ("re", "qu"):
+                rect = Rect(item[1]) if item[0] == "re" else item[1].rect
+                if rect.height <= RULING_THICKNESS:
+                    n_horizontal_rulings += 1
+                elif rect.width > RULING_THICKNESS and drawing["fill"] is not None:
+                    n_graphic_shapes += 1
+            elif item[0] == "c":
+                n_graphic_shapes += 1
+
+    return PageProfile(
+        has_text_layer=bool(text_blocks),
+        text_coverage=round(_coverage(text_blocks, page_rect), 4),
+        image_coverage=round(_coverage(image_rects, page_rect), 4),
+        n_drawings=len(drawings),
+        n_lines=n_lines,
+        n_graphic_shapes=n_graphic_shapes,
+        ruling_density=round(n_horizontal_rulings / (page_rect.height / 100), 4),
+        numeric_row_ratio=round(_numeric_row_ratio(page), 4),
+    )
+
+
+def choose_route(profile: PageProfile) -> PageRoute:
+    """
+    Choose the cheapest pipeline able to handle a page:
+
+    - text_only: plain text pages, extracted directly with no LLM calls
+    - table: text with ruled tables, extracted deterministically with tabula
+    - vision: scanned pages, images and charts, which need the full vision pipeline
+    """
+    if profile.image_coverage > SCANNED_IMAGE_COVERAGE:
+        return "vision"
+    if not profile.has_text_layer:
+        # Blank pages have nothing to extract
+        if profile.image_coverage == 0 and profile.n_drawings == 0:
+            return "text_only"
+        return "vision"
+    if (
+        profile.image_coverage > FIGURE_IMAGE_COVERAGE
+        or profile.n_graphic_shapes >= GRAPHIC_SHAPE_COUNT
+    ):
+        return "vision"
+    if (
+        profile.ruling_density >= TABLE_RULING_DENSITY
+        or profile.numeric_row_ratio >= TABLE_NUMERIC_ROW_RATIO
+    ):
+        return "table"
+    return "text_only"
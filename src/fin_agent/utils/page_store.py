@@ -0,0 +1,113 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import ujson as json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_pages (
+    fingerprint TEXT PRIMARY KEY,
+    output TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parsed_pages_used_at ON parsed_pages (used_at);
+"""
+
+
+class PageStore:
+    """
+    Parsed pages keyed by page fingerprint, stored in a single SQLite file.
+
+    The store is shared by every workflow session and worker process on the host
+    (like the job queue, the file must be on a local filesystem), so a revised
+    filing reuses the pages parsed for the previous version wherever they were
+    parsed. Only the parsed output is kept. Pages which have not been used for
+    max_age_days are dropped, as are the least recently used pages once the
+    stored outputs exceed max_mb.
+    """
+
+    def __init__(
+        self,
+        db_file: str | Path,
+        max_age_days: float | None = 90,
+        max_mb: float | None = 1024,
+    ):
+        self.db_file = str(db_file)
+        self.max_age_seconds = None if max_age_days is None else max_age_days * 86400
+        self.max_bytes = None if max_mb is None else int(max_mb * 1024 * 1024)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM parsed_pages").fetchone()[0]
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT output FROM parsed_pages WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE parsed_pages SET used_at = ? WHERE fingerprint = ?",
+                (time.time(), fingerprint),
+            )
+        return json.loads(row["output"])
+
+    def put(self, fingerprint: str, output: dict[str, Any]) -> None:
+        data = json.dumps(output)
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO parsed_pages
+                        (fingerprint, output, size, created_at, used_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (fingerprint, data, len(data), now, now),
+                )
+                self._prune(connection, now)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        if self.max_age_seconds is not None:
+            connection.execute(
+                "DELETE FROM parsed_pages WHERE used_at < ?",
+                (now - self.max_age_seconds,),
+            )
+        if self.max_bytes is not None:
+            # Keep the most recently used pages which fit within the size limit
+            connection.execute(
+                """
+                DELETE FROM parsed_pages WHERE fingerprint IN (
+                    SELECT fingerprint FROM (
+                        SELECT fingerprint, SUM(size) OVER (
+                            ORDER BY used_at DESC, fingerprint
+                        ) AS total_size
+                        FROM parsed_pages
+                    )
+                    WHERE total_size > ?
+                )
+                """,
+                (self.max_bytes,),
+            )
@@ -1,3 +1,4 @@
+import time
 from textwrap import dedent
 from typing import Any
 
@@ -7,23 +8,41 @@ from agno.agent import RunResponse
 from agno.media import Image
 from agno.utils.log import logger
 from agno.workflow import Workflow
+from pymupdf import Rect
 from pydantic import BaseModel, TypeAdapter, field_serializer, field_validator
 
 from fin_agent.utils.document_parsing import (
     b64_str_from_image,
-    b64_str_from_pdf_page,
+    extract_financial_tables_from_pdf,
+    extract_text_from_pdf_page,
     image_from_b64_str,
-    retrieve_pdf_page,
+    image_from_pdf_page,
+    open_pdf_page,
 )
+from fin_agent.utils.chart_extraction import extract_chart_data
+from fin_agent.utils.financial_tables import FinancialTable
+from fin_agent.utils.memory import MB, current_rss_bytes
+from fin_agent.utils.page_fingerprint import fingerprint_pdf_page
+from fin_agent.utils.page_profile import PageRoute, choose_route, profile_pdf_page
+from fin_agent.utils.page_store import PageStore
+from fin_agent.agents.action_generation.table_tools import table_store, tables_prompt
 from fin_agent.agents.document_parser.models import BoundingBox
-from fin_agent.agents.document_parser.bbox_inspector import bbox_inspector
-from fin_agent.agents.document_parser.content_summarizer import content_summarizer
+from fin_agent.agents.document_parser.bbox_inspector import create_bbox_inspector
+from fin_agent.agents.document_parser.content_summarizer import (
+    create_content_summarizer,
+)
+from fin_agent.agents.pool import AgentPool
+from fin_agent.settings import app_settings
 from fin_agent.utils.document_parsing import crop_image
 
 
 class ParsedPage(BaseModel):
     page_content: list[str | list[str]]
     page_images: list[Image | str]
+    route: PageRoute = "vision"
+    # The cells of the page's tables by name. page_content only holds the table
+    # schemas, the values are looked up by the planner from the table store
+    tables: dict[str, list[list[str]]] = {}
 
     @field_validator("page_images", mode="before")
     @classmethod
@@ -88,8 +107,18 @@ class PdfContextExtractionWorkflow(Workflow):
         page of a PDF annual financial report."""
     )
 
-    content_summarizer = content_summarizer
-    bbox_inspector = bbox_inspector
+    # Agents hold per-run state, so each page being parsed takes its own agents
+    # from a pool. The pools are shared by every copy of the workflow (Playground
+    # copies it per session) and reuse the same Groq client.
+    content_summarizer_pool = AgentPool(create_content_summarizer)
+    bbox_inspector_pool = AgentPool(create_bbox_inspector)
+    # Parsed pages are stored on disk rather than in the session state, so they
+    # are reused by every session and worker process and do not grow the RSS
+    page_store = PageStore(
+        app_settings.PAGE_STORE_DB_FILE,
+        max_age_days=app_settings.PAGE_STORE_MAX_AGE_DAYS,
+        max_mb=app_settings.PAGE_STORE_MAX_MB,
+    )
 
     def run(
         self,
@@ -102,30 +131,147 @@ class PdfContextExtractionWorkflow(Workflow):
         page_number = message_dict["page_number"]
         pdf_url = message_dict["pdf_url"]
 
-        cache_key = f"{pdf_url}_{page_number}"
-        run_cache = self.session_state.get(cache_key, {})
+        logger.info(f"Retrieving page {page_number} from PDF {pdf_url}")
+        # The page (and its document) is closed as soon as it has been processed
+        with open_pdf_page(pdf_url, page_number) as page:
+            logger.info(f"Retrieved page {page_number} from PDF {pdf_url}")
+
+            # Results are cached by page content rather than by location, so revised
+            # filings only re-process the pages that changed and identical pages
+            # shared across filings are only processed once
+            fingerprint = fingerprint_pdf_page(page)
+            output = None if overwrite_cache else self.page_store.get(fingerprint)
+            if output is not None:
+                logger.info(
+                    f"Using stored result for page {page_number} from PDF {pdf_url} "
+                    f"(fingerprint {fingerprint[:12]})"
+                )
+                parsed_page = TypeAdapter(ParsedPage).validate_python(output)
+                self.register_tables(parsed_page)
+                return RunResponse(run_id=self.run_id, content=parsed_page)
 
-        if run_cache and run_cache.get("output") and not overwrite_cache:
+            # Only pages which need it are sent through the (slow) vision pipeline
+            profiling_started = time.perf_counter()
+            profile = profile_pdf_page(page)
+            route = choose_route(profile)
             logger.info(
-                f"Using cached result for page {page_number} from PDF {pdf_url}"
+                f"Routing page {page_number} from PDF {pdf_url} to the {route} "
+                f"pipeline (profiled in "
+                f"{(time.perf_counter() - profiling_started) * 1000:.1f} ms)"
             )
-            parsed_page = TypeAdapter(ParsedPage).validate_python(run_cache["output"])
-            return RunResponse(run_id=self.run_id, content=parsed_page)
 
-        logger.info(f"Retrieving page {page_number} from PDF {pdf_url}")
-        page = retrieve_pdf_page(pdf_url, page_number)
-        logger.info(f"Retrieved page {page_number} from PDF {pdf_url}")
+            if route == "vision":
+                parsed_page = self.parse_page(
+                    page=page,
+                    pdf_url=pdf_url,
+                    page_number=page_number,
+                    n_max_bbox_iterations=n_max_bbox_iterations,
+                )
+            else:
+                parsed_page = self.parse_page_without_llm(
+                    page=page, pdf_url=pdf_url, page_number=page_number, route=route
+                )
+
+        self.page_store.put(fingerprint, parsed_page.model_dump())
+        self.register_tables(parsed_page)
+        route_counts = self.session_state.setdefault("route_counts", {})
+        route_counts[route] = route_counts.get(route, 0) + 1
+        logger.info(
+            f"Parsed page {page_number} from PDF {pdf_url} "
+            f"(RSS {current_rss_bytes() / MB:.0f} MB)"
+        )
 
-        image_str = b64_str_from_pdf_page(page)
-        full_page_image = image_from_b64_str(image_str)
-        run_cache["full_page_image"] = image_str
+        return RunResponse(run_id=self.run_id, content=parsed_page)
 
-        content_summarizer_response = self.content_summarizer.run(
-            message="Summarize the content of this page.",
-            images=[full_page_image],
+    def register_tables(self, parsed_page: ParsedPage) -> None:
+        """Register the page's tables for the planner to look values up from."""
+        if parsed_page.tables:
+            table_store.add_tables(
+                self.session_id,
+                [
+                    FinancialTable.from_rows(name, rows)
+                    for name, rows in parsed_page.tables.items()
+                ],
+            )
+
+    @staticmethod
+    def extract_tables(
+        pdf_url: str,
+        page_number: int,
+        tables: dict[str, list[list[str]]],
+        bounding_box: BoundingBox | None = None,
+    ) -> tuple[str | None, list[Rect]]:
+        """
+        Extract the tables in the bounding box, adding their cells to tables.
+
+        Returns:
+            tuple[str | None, list[Rect]]: The schemas of the tables for the page
+                content (None if there are no tables), and the areas of the tables
+        """
+        # tabula page numbers are 1-indexed
+        extracted = extract_financial_tables_from_pdf(
+            pdf_url, page_number + 1, bounding_box
+        )
+        for table, _ in extracted:
+            # Named by page, so tables from several pages can share a session
+            table.name = f"page_{page_number + 1}_table_{len(tables) + 1}"
+            tables[table.name] = table.rows
+        schemas = (
+            tables_prompt([table for table, _ in extracted]) if extracted else None
         )
+        return schemas, [area for _, area in extracted]
+
+    def release_idle_agents(self) -> int:
+        """
+        Drop the idle agents held by the workflow's agent pools.
+
+        Returns:
+            int: The number of agents dropped
+        """
+        return self.content_summarizer_pool.clear() + self.bbox_inspector_pool.clear()
+
+    def parse_page_without_llm(
+        self,
+        page: pymupdf.Page,
+        pdf_url: str,
+        page_number: int,
+        route: PageRoute,
+    ) -> ParsedPage:
+        if route != "table":
+            return ParsedPage(
+                page_content=[extract_text_from_pdf_page(page)],
+                page_images=[],
+                route=route,
+            )
+
+        # The table values are looked up by the planner, so the text of the tables
+        # is left out of the page text
+        tables = {}
+        schemas, areas = self.extract_tables(pdf_url, page_number, tables)
+        page_content = [extract_text_from_pdf_page(page, exclude=areas)]
+        if schemas:
+            page_content.append(schemas)
+        return ParsedPage(
+            page_content=page_content, page_images=[], route=route, tables=tables
+        )
+
+    def parse_page(
+        self,
+        page: pymupdf.Page,
+        pdf_url: str,
+        page_number: int,
+        n_max_bbox_iterations: int,
+    ) -> ParsedPage:
+        # The full page image is only needed while the page is being parsed and
+        # is deliberately not kept in the (stored) output
+        full_page_image = Image(content=image_from_pdf_page(page))
+
+        with self.content_summarizer_pool.acquire(self.session_id) as summarizer:
+            content_summarizer_response = summarizer.run(
+                message="Summarize the content of this page.",
+                images=[full_page_image],
+            )
 
-        run_cache["content_summarizer_response"] = content_summarizer_response.content
         section_bounds = []
         for section in content_summarizer_response.content.sections:
             message = construct_inspector_message(
@@ -135,10 +281,11 @@ class PdfContextExtractionWorkflow(Workflow):
             )
             previous_choices = []
             for iteration in range(n_max_bbox_iterations):
-                inspector_response = self.bbox_inspector.run(
-                    message=message["message"],
-                    images=message["images"],
-                ).content
+                with self.bbox_inspector_pool.acquire(self.session_id) as inspector:
+                    inspector_response = inspector.run(
+                        message=message["message"],
+                        images=message["images"],
+                    ).content
                 if (
                     inspector_response.is_accurate
                     or iteration == n_max_bbox_iterations - 1
@@ -163,4 +310,50 @@ class PdfContextExtractionWorkflow(Workflow):
                         previous_choices=previous_choices,
                     )
 
-        return RunResponse(run_id=self.run_id, content=run_cache["output"])
+        # Tables are extracted first, so their text can be left out of the text
+        # sections overlapping them
+        tables = {}
+        table_schemas = {}
+        table_areas = []
+        for i, section in enumerate(section_bounds):
+            if section["content_type"] == "table":
+                table_schemas[i], areas = self.extract_tables(
+                    pdf_url, page_number, tables, section["bounding_box"]
+                )
+                table_areas += areas
+
+        page_content = []
+        page_images = []
+        for i, section in enumerate(section_bounds):
+            if section["content_type"] == "table":
+                if table_schemas[i]:
+                    page_content.append(table_schemas[i])
+            elif section["content_type"] == "graph":
+                # Vector charts are passed on as data, falling back to an image
+                # only when there are no vector drawings to read values from
+                chart = extract_chart_data(page, section["bounding_box"])
+                if chart is not None:
+                    page_content.append(chart.to_markdown())
+                    continue
+                page_images.append(
+                    crop_image(
+                        image=full_page_image,
+                        image_width=page.rect[2],
+                        image_height=page.rect[3],
+                        bounding_box=section["bounding_box"]
+                        or {"x_min": 0, "y_min": 0, "x_max": 100, "y_max": 100},
+                    )
+                )
+            else:
+                page_content.append(
+                    extract_text_from_pdf_page(
+                        page, section["bounding_box"], exclude=table_areas
+                    )
+                )
+
+        return ParsedPage(
+            page_content=page_content,
+            page_images=page_images,
+            route="vision",
+            tables=tables,
+        )
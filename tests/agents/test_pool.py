@@ -0,0 +1,157 @@
+import asyncio
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import httpx
+from agno.agent import Agent
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from agno.playground import Playground
+
+from fin_agent.agents.groq import groq_model
+from fin_agent.agents.pool import AgentPool, PooledAgent
+
+LATENCY = 0.2
+
+
+@dataclass
+class EchoModel(Model):
+    """A local stand-in for an LLM which replies with the last user message."""
+
+    id: str = "echo"
+    provider: str = "local"
+
+    @staticmethod
+    def reply(messages):
+        return next(m.content for m in reversed(messages) if m.role == "user")
+
+    def invoke(self, messages):
+        time.sleep(LATENCY)
+        return self.reply(messages)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(LATENCY)
+        return self.reply(messages)
+
+    def invoke_stream(self, messages):
+        yield self.invoke(messages)
+
+    async def ainvoke_stream(self, messages):
+        yield await self.ainvoke(messages)
+
+    def parse_provider_response(self, response):
+        return ModelResponse(role="assistant", content=response)
+
+    def parse_provider_response_delta(self, response):
+        return ModelResponse(role="assistant", content=response)
+
+
+def create_echo_agent() -> Agent:
+    return Agent(model=EchoModel(), add_history_to_messages=True)
+
+
+def test_parallel_requests_scale_without_cross_talk():
+    pool = AgentPool(create_echo_agent)
+    n_requests = 8
+
+    def handle(i: int) -> tuple[str, int, str | None]:
+        with pool.acquire(session_id=f"session_{i}") as agent:
+            response = agent.run(f"request {i}")
+            return response.content, id(agent), agent.session_id
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(n_requests) as executor:
+        results = list(executor.map(handle, range(n_requests)))
+    elapsed = time.perf_counter() - started
+
+    assert [content for content, _, _ in results] == [
+        f"request {i}" for i in range(n_requests)
+    ]
+    assert [session_id for _, _, session_id in results] == [
+        f"session_{i}" for i in range(n_requests)
+    ]
+    # Requests run concurrently on separate agents rather than queueing on one
+    assert len({agent_id for _, agent_id, _ in results}) == n_requests
+    assert elapsed < n_requests * LATENCY / 2
+
+
+def test_released_agents_are_reused_with_a_clean_session():
+    pool = AgentPool(create_echo_agent)
+
+    with pool.acquire(session_id="first") as agent:
+        agent.run("secret")
+        first_agent = agent
+
+    with pool.acquire() as agent:
+        assert agent is first_agent
+        assert agent.session_id is None
+        response = agent.run("hello")
+        assert response.content == "hello"
+        assert "secret" not in [m.content for m in response.messages]
+
+
+def test_idle_agents_are_capped():
+    pool = AgentPool(create_echo_agent, max_idle=1)
+
+    with pool.acquire(), pool.acquire():
+        pass
+
+    assert len(pool._idle) == 1
+
+
+def test_groq_models_share_a_client():
+    first = groq_model(id="model")
+    second = groq_model(id="model")
+
+    assert first is not second
+    assert first.get_client() is second.get_client()
+    # agno deep copies models, which must keep the shared clients
+    assert copy.deepcopy(first).get_client() is first.get_client()
+
+
+def test_playground_runs_concurrently_without_cross_talk():
+    agent = PooledAgent(create_echo_agent)
+    app = Playground(agents=[agent]).get_app(use_async=True)
+    url = f"/v1/playground/agents/{agent.agent_id}/runs"
+    n_requests = 8
+
+    async def run_all(stream: bool) -> list[str]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        url,
+                        data={
+                            "message": f"request {i}",
+                            "session_id": f"session_{i}",
+                            "stream": str(stream).lower(),
+                        },
+                    )
+                    for i in range(n_requests)
+                )
+            )
+        return [response.text if stream else response.json() for response in responses]
+
+    started = time.perf_counter()
+    results = asyncio.run(run_all(stream=False))
+    elapsed = time.perf_counter() - started
+
+    assert [result["content"] for result in results] == [
+        f"request {i}" for i in range(n_requests)
+    ]
+    assert [result["session_id"] for result in results] == [
+        f"session_{i}" for i in range(n_requests)
+    ]
+    assert elapsed < n_requests * LATENCY / 2
+    # Each concurrent request was served by its own agent
+    assert len(agent.pool._idle) == n_requests
+
+    streams = asyncio.run(run_all(stream=True))
+    for i, stream in enumerate(streams):
+        assert f"request {i}" in stream
+        assert all(f"request {j}" not in stream for j in range(n_requests) if j != i)
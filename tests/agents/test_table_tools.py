@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import ujson as json
+
+from fin_agent.agents.action_generation.table_tools import (
+    TableQueryTools,
+    TableStore,
+    tables_prompt,
+)
+from fin_agent.utils.financial_tables import FinancialTable
+
+TABLE = FinancialTable.from_rows(
+    "table_1", [["", "2009", "2008"], ["net income", "103,102", "(104,222)"]]
+)
+
+
+def test_lookup_tool_reads_the_session_tables():
+    store = TableStore()
+    store.set_tables("session", [TABLE])
+    tools = TableQueryTools(store)
+
+    result = tools.lookup_table_value(
+        SimpleNamespace(session_id="session"), "table_1", "net income", "2008"
+    )
+
+    assert json.loads(result)["value"] == -104222.0
+    assert "Unknown table" in tools.lookup_table_value(
+        SimpleNamespace(session_id="other"), "table_1", "net income", "2008"
+    )
+    # The agent is injected by agno rather than chosen by the model
+    function = tools.functions["lookup_table_value"]
+    function.process_entrypoint()
+    parameters = function.to_dict()["parameters"]
+    assert list(parameters["properties"]) == ["table", "row", "column"]
+
+
+def test_lookups_are_cached_per_session(monkeypatch):
+    store = TableStore()
+    store.set_tables("session", [TABLE])
+    first = store.lookup("session", "table_1", "net income", "2009")
+
+    def fail(*args):
+        raise AssertionError("Cached lookups should not query the table")
+
+    monkeypatch.setattr(TABLE, "lookup", fail)
+    assert store.lookup("session", "table_1", "net income", "2009") == first
+
+    # Replacing the tables of a session clears its cache
+    store.set_tables("session", [])
+    assert "Unknown table" in store.lookup("session", "table_1", "net income", "2009")
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = TableStore(max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        store.set_tables(session_id, [TABLE])
+
+    assert store.get_tables("a") == {}
+    assert list(store.get_tables("c")) == ["table_1"]
+
+
+def test_tables_prompt_only_has_the_schema():
+    prompt = tables_prompt([TABLE])
+
+    assert "table_1: 1 rows x 2 columns" in prompt
+    assert "103" not in prompt
+
+
+def test_added_tables_extend_the_session():
+    store = TableStore()
+    store.set_tables("session", [TABLE])
+    cached = store.lookup("session", "table_1", "net income", "2009")
+    other = FinancialTable.from_rows("table_2", [["", "2010"], ["net income", "5"]])
+    store.add_tables("session", [other])
+
+    assert list(store.get_tables("session")) == ["table_1", "table_2"]
+    assert store.lookup("session", "table_1", "net income", "2009") == cached
+
+    # Replacing a table clears its cached lookups
+    replaced = FinancialTable.from_rows("table_1", [["", "2009"], ["net income", "7"]])
+    store.add_tables("session", [replaced])
+    assert (
+        json.loads(store.lookup("session", "table_1", "net income", "2009"))["value"]
+        == 7.0
+    )
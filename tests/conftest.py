@@ -0,0 +1,44 @@
+import os
+from typing import Callable
+
+import httpx
+import pytest
+
+# The settings are loaded at import time, provide placeholders for the test run
+os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault("RELOAD_ENABLED", "false")
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+
+@pytest.fixture
+def serve_pdf(monkeypatch) -> Callable[[bytes], str]:
+    """Serve the given PDF bytes to open_pdf_page, returning the URL to request."""
+
+    client = httpx.Client
+
+    def serve(pdf_bytes: bytes) -> str:
+        # Imported here, as the settings are loaded on import
+        from fin_agent.utils import document_parsing
+
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=pdf_bytes)
+        )
+        monkeypatch.setattr(
+            document_parsing.httpx, "Client", lambda: client(transport=transport)
+        )
+        return "https://example.com/report.pdf"
+
+    return serve
+
+
+@pytest.fixture(autouse=True)
+def page_store(tmp_path, monkeypatch):
+    """Give every test its own store of parsed pages."""
+    from fin_agent.utils.page_store import PageStore
+    from fin_agent.workflows.extract_document_context import (
+        PdfContextExtractionWorkflow,
+    )
+
+    store = PageStore(tmp_path / "pages.db")
+    monkeypatch.setattr(PdfContextExtractionWorkflow, "page_store", store)
+    return store
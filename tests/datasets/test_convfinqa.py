@@ -0,0 +1,113 @@
+import polars as pl
+import ujson as json
+
+from fin_agent.datasets.convfinqa import (
+    ConvFinQADataset,
+    _flatten_example,
+    convert_convfinqa,
+)
+
+EXAMPLES = [
+    {
+        "id": "Single_JKHY/2009/page_28.pdf-3",
+        "filename": "JKHY/2009/page_28.pdf",
+        "pre_text": ["26 | 2009 annual report"],
+        "post_text": ["year ended june 30 , cash provided"],
+        "table": [["", "2009", "2008"], ["net income", "103102", "104222"]],
+        "qa": {
+            "question": "what was the percentage change in net income?",
+            "answer": "-1.1%",
+            "program": "subtract(103102, 104222), divide(#0, 104222)",
+        },
+        "annotation": {
+            "dialogue_break": [
+                "what was the net income in 2009?",
+                "and the percentage change from 2008?",
+            ],
+            "turn_program": ["103102", "subtract(103102, 104222), divide(#0, 104222)"],
+            "exe_ans_list": [103102.0, -0.01075],
+        },
+    },
+    {
+        "id": "Double_UPS/2009/page_33.pdf",
+        "filename": "UPS/2009/page_33.pdf",
+        "pre_text": [],
+        "post_text": [],
+        "table": [["", "12/31/04", "12/31/09"], ["ups", "100.00", "75.95"]],
+        "qa_0": {
+            "question": "what was the change?",
+            "answer": "-24.05",
+            "program": "subtract(75.95, 100)",
+        },
+        "qa_1": {
+            "question": "and in percent?",
+            "answer": "-24.05%",
+            "program": "subtract(75.95, 100), divide(#0, 100)",
+        },
+        "annotation": {
+            "dialogue_break": ["what was the change?", "and in percent?"],
+            "turn_program": [
+                "subtract(75.95, 100)",
+                "subtract(75.95, 100), divide(#0, 100)",
+            ],
+            "exe_ans_list": [-24.05, "-0.2405"],
+        },
+    },
+]
+
+
+def write_examples(tmp_path):
+    json_path = tmp_path / "train.json"
+    json_path.write_text(json.dumps(EXAMPLES))
+    return json_path
+
+
+def test_convert_convfinqa(tmp_path):
+    output_path = convert_convfinqa(write_examples(tmp_path), tmp_path / "train.arrow")
+    dataset = ConvFinQADataset(output_path)
+
+    assert len(dataset) == 2
+    row = dataset.get("JKHY/2009/page_28.pdf")[0]
+    assert row["company"] == "JKHY"
+    assert row["year"] == 2009
+    assert row["page_number"] == 28
+    assert row["table"][1] == ["net income", "103102", "104222"]
+    assert row["turn_answers"] == ["103102.0", "-0.01075"]
+    assert row["n_turns"] == 2
+    assert row["is_multi_turn"] is True
+    assert row["n_questions"] == 1
+    assert row["is_hybrid"] is False
+
+
+def test_non_numeric_turn_answers_are_kept():
+    example = EXAMPLES[0] | {
+        "annotation": {
+            "dialogue_break": ["did net income fall?"],
+            "exe_ans_list": ["yes"],
+        }
+    }
+
+    row = _flatten_example(example)
+
+    assert row["turn_answers"] == ["yes"]
+    assert row["is_multi_turn"] is False
+
+
+def test_filter_and_sample(tmp_path):
+    dataset = ConvFinQADataset.from_json(write_examples(tmp_path))
+
+    assert len(dataset.filter(is_multi_turn=True)) == 2
+    hybrid = dataset.filter(is_hybrid=True)
+    assert len(hybrid) == 1
+    assert hybrid.frame["questions"][0].to_list() == [
+        "what was the change?",
+        "and in percent?",
+    ]
+
+    sampled = dataset.sample(5, pl.col("year") == 2009, seed=0)
+    assert len(sampled) == 2
+
+
+def test_iter_batches(tmp_path):
+    dataset = ConvFinQADataset.from_json(write_examples(tmp_path))
+    assert [batch.height for batch in dataset.iter_batches(batch_size=1)] == [1, 1]
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from fin_agent.agents.action_generation.action_planner import (
+    advanced_planner_instructions,
+)
+from fin_agent.agents.action_generation.table_tools import table_store
+from fin_agent.evaluate.action_planner import example_tables, planner_message
+
+EXAMPLE = {
+    "pre_text": ["26 | 2009 annual report"],
+    "post_text": ["year ended june 30 , cash provided"],
+    "table": [["", "2009", "2008"], ["net income", "103102", "104222"]],
+    "questions": ["what was the percentage change in net income?"],
+}
+
+
+def test_planner_message_has_the_table_schema_but_not_its_values():
+    message = planner_message(EXAMPLE, example_tables(EXAMPLE))
+
+    assert message.startswith("26 | 2009 annual report")
+    assert "rows: net income" in message
+    assert "103102" not in message
+    assert message.endswith("Question: what was the percentage change in net income?")
+
+
+def test_planner_is_told_to_look_up_values_of_registered_tables():
+    table_store.set_tables("example", example_tables(EXAMPLE))
+    instructions = advanced_planner_instructions(SimpleNamespace(session_id="example"))
+
+    assert any("lookup_table_value" in line for line in instructions)
+    assert table_store.lookup("example", "table_1", "net income", "2009")
+
+
+def test_planner_is_not_told_about_tables_when_none_are_registered():
+    table_store.set_tables("no tables", example_tables({**EXAMPLE, "table": []}))
+
+    for session_id in ("no tables", None):
+        instructions = advanced_planner_instructions(
+            SimpleNamespace(session_id=session_id)
+        )
+        assert not any("lookup_table_value" in line for line in instructions)
@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fin_agent.jobs.api import get_job_queue, router
+from fin_agent.jobs.queue import JobQueue
+
+
+def test_submit_status_and_result(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    client = TestClient(app)
+
+    response = client.post(
+        "/jobs", json={"pdf_url": "https://example.com/report.pdf", "page_number": 3}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "pending"
+    assert client.get(f"/jobs/{job_id}/result").status_code == 409
+    assert client.get("/jobs/missing").status_code == 404
+
+    job = queue.claim("worker-1")
+    assert job.payload == {
+        "pdf_url": "https://example.com/report.pdf",
+        "page_number": 3,
+    }
+    queue.complete(job.job_id, "worker-1", {"page_content": ["text"]})
+    assert client.get(f"/jobs/{job_id}/result").json() == {"page_content": ["text"]}
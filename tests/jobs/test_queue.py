@@ -0,0 +1,145 @@
+import itertools
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+import typer
+
+from fin_agent.agents.pool import AgentPool
+from fin_agent.jobs import worker
+from fin_agent.jobs.queue import JobPriority, JobQueue
+from fin_agent.jobs.worker import process_next_job, run_worker, run_workers
+from fin_agent.workflows.extract_document_context import PdfContextExtractionWorkflow
+
+
+def test_interactive_jobs_are_claimed_before_bulk_jobs(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    bulk_id = queue.submit("extract_page", {"page_number": 1}, JobPriority.BULK)
+    interactive_id = queue.submit("extract_page", {"page_number": 2})
+
+    assert queue.claim("worker-1").job_id == interactive_id
+    assert queue.claim("worker-1").job_id == bulk_id
+    assert queue.claim("worker-1") is None
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+    job_id = queue.submit("extract_page", {})
+
+    assert queue.claim("worker-1").job_id == job_id
+    assert queue.claim("worker-2") is None
+    time.sleep(0.1)
+
+    job = queue.claim("worker-2")
+    assert job.job_id == job_id
+    assert job.attempts == 2
+    # The original worker no longer holds the lease
+    assert not queue.complete(job_id, "worker-1", {"ok": True})
+    assert queue.complete(job_id, "worker-2", {"ok": True})
+    assert queue.get(job_id).result == {"ok": True}
+
+
+def test_failed_jobs_are_retried_until_max_attempts(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", retry_backoff_seconds=0)
+    job_id = queue.submit("extract_page", {}, max_attempts=2)
+
+    for _ in range(2):
+        job = queue.claim("worker-1")
+        assert queue.fail(job.job_id, "worker-1", "boom")
+
+    job = queue.get(job_id)
+    assert job.status == "failed"
+    assert job.error == "boom"
+    assert queue.claim("worker-1") is None
+
+
+def test_process_next_job(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", retry_backoff_seconds=0)
+    ok_id = queue.submit("double", {"value": 2})
+    bad_id = queue.submit("unknown", {}, JobPriority.BULK, max_attempts=1)
+    handlers = {"double": lambda job: job.payload["value"] * 2}
+
+    assert process_next_job(queue, "worker-1", handlers)
+    assert process_next_job(queue, "worker-1", handlers)
+    assert not process_next_job(queue, "worker-1", handlers)
+
+    assert queue.get(ok_id).result == 4
+    assert queue.get(bad_id).status == "failed"
+    assert queue.counts() == {"succeeded": 1, "failed": 1}
+
+
+def test_worker_exits_when_over_memory_budget(tmp_path, monkeypatch):
+    workflow = PdfContextExtractionWorkflow()
+    workflow.content_summarizer_pool = AgentPool(
+        lambda: SimpleNamespace(model=None, memory=None)
+    )
+    with workflow.content_summarizer_pool.acquire():
+        pass
+    monkeypatch.setattr(worker, "create_extraction_workflow", lambda: workflow)
+    # Within budget on startup, over it from then on
+    over_budget = itertools.chain([False], itertools.repeat(True))
+    monkeypatch.setattr(
+        worker.MemoryBudget, "is_over_budget", lambda self: next(over_budget)
+    )
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.submit("extract_page", {})
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_worker(
+            str(tmp_path / "jobs.db"),
+            poll_interval=0.01,
+            memory_budget_mb=1,
+            memory_timeout=0.05,
+        )
+
+    assert exit_info.value.code == 1
+    # The idle agents are dropped before giving up, and no job is claimed
+    assert workflow.content_summarizer_pool.clear() == 0
+    assert queue.get(job_id).status == "pending"
+
+
+def test_worker_exits_when_started_over_memory_budget(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        run_worker(str(tmp_path / "jobs.db"), memory_budget_mb=1)
+
+    assert exit_info.value.code == worker.EXIT_MEMORY_BUDGET_TOO_LOW
+
+
+def test_failing_workers_are_restarted_with_a_limit(tmp_path, monkeypatch):
+    starts = tmp_path / "starts"
+
+    def failing_worker(*args, **kwargs):
+        with open(starts, "a") as f:
+            f.write("started\n")
+        sys.exit(1)
+
+    monkeypatch.setattr(worker, "run_worker", failing_worker)
+    started = time.monotonic()
+    with pytest.raises(typer.Exit):
+        run_workers(
+            workers=1,
+            db_file=str(tmp_path / "jobs.db"),
+            poll_interval=0.01,
+            memory_budget_mb=None,
+            max_restarts=3,
+            restart_backoff=0.05,
+            min_uptime=60,
+        )
+
+    assert starts.read_text().count("started") == 4
+    # Restarts back off: 0.05 + 0.1 + 0.2 seconds
+    assert time.monotonic() - started >= 0.35
+
+
+def test_workers_are_not_restarted_when_the_budget_is_too_low(tmp_path):
+    with pytest.raises(typer.BadParameter):
+        run_workers(
+            workers=2,
+            db_file=str(tmp_path / "jobs.db"),
+            poll_interval=0.01,
+            memory_budget_mb=1,
+            max_restarts=3,
+            restart_backoff=0.05,
+            min_uptime=60,
+        )
@@ -0,0 +1,118 @@
+import pymupdf
+import pytest
+
+from fin_agent.agents.document_parser.models import BoundingBox
+from fin_agent.utils.chart_extraction import extract_chart_data
+
+LEFT, BOTTOM, HEIGHT = 100, 500, 400
+YEARS = ["2005", "2006", "2007", "2008"]
+
+
+def y_for(value: float) -> float:
+    return BOTTOM - value / 200 * HEIGHT
+
+
+def add_axis(page: pymupdf.Page) -> None:
+    for tick in range(0, 201, 50):
+        # Centre the label on the tick
+        page.insert_text((LEFT - 30, y_for(tick) + 3), str(tick), fontsize=8)
+    for i, year in enumerate(YEARS):
+        page.insert_text((LEFT + 20 + i * 100, BOTTOM + 14), year, fontsize=8)
+    page.draw_line((LEFT, BOTTOM), (LEFT + 400, BOTTOM))
+    page.draw_line((LEFT, BOTTOM), (LEFT, BOTTOM - HEIGHT))
+
+
+def test_extract_bar_chart_with_legend():
+    page = pymupdf.open().new_page()
+    add_axis(page)
+    series = {
+        "UPS": ([100, 120, 90, 75], (0.2, 0.4, 0.7)),
+        "S&P 500": ([100, 110, 115, 70], (0.8, 0.3, 0.1)),
+    }
+    for s, (values, colour) in enumerate(series.values()):
+        for i, value in enumerate(values):
+            x = LEFT + 20 + i * 100 + s * 25
+            page.draw_rect(
+                pymupdf.Rect(x, y_for(value), x + 20, BOTTOM), color=None, fill=colour
+            )
+    for s, (name, (_, colour)) in enumerate(series.items()):
+        page.draw_rect(
+            pymupdf.Rect(450, 60 + s * 15, 458, 68 + s * 15), color=None, fill=colour
+        )
+        page.insert_text((462, 67 + s * 15), name, fontsize=8)
+
+    chart = extract_chart_data(page)
+
+    assert chart.chart_type == "bar"
+    assert chart.x_labels == YEARS
+    assert list(chart.series) == ["UPS", "S&P 500"]
+    for name, (values, _) in series.items():
+        assert chart.series[name] == pytest.approx(values, abs=0.5)
+    assert "| 2006 |" in chart.to_markdown()
+
+
+def test_extract_line_chart():
+    page = pymupdf.open().new_page()
+    add_axis(page)
+    values = [50, 80, 140, 160]
+    points = [(LEFT + 30 + i * 100, y_for(v)) for i, v in enumerate(values)]
+    page.draw_polyline(points, color=(0, 0, 0))
+
+    chart = extract_chart_data(page, BoundingBox(x_min=5, y_min=5, x_max=95, y_max=95))
+
+    assert chart.chart_type == "line"
+    assert chart.series["line_1"] == pytest.approx(values, abs=0.5)
+
+
+def test_text_below_the_x_labels_is_ignored():
+    page = pymupdf.open().new_page()
+    add_axis(page)
+    page.insert_text((LEFT + 5, BOTTOM + 30), "Fiscal year", fontsize=8)
+    page.insert_text((LEFT + 160, BOTTOM + 44), "Source: company", fontsize=8)
+    values = [50, 80, 140, 160]
+    points = [(LEFT + 30 + i * 100, y_for(v)) for i, v in enumerate(values)]
+    page.draw_polyline(points, color=(0, 0, 0))
+
+    chart = extract_chart_data(page)
+
+    assert chart.x_labels == YEARS
+    assert chart.series["line_1"] == pytest.approx(values, abs=0.5)
+
+
+def test_raster_chart_is_not_extracted():
+    page = pymupdf.open().new_page()
+    page.insert_text((72, 72), "Cumulative total return")
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 50, 50), False)
+    page.insert_image(pymupdf.Rect(100, 100, 400, 400), pixmap=pixmap)
+
+    assert extract_chart_data(page) is None
+
+
+def test_stacked_bar_segments_are_read_as_their_heights():
+    page = pymupdf.open().new_page()
+    add_axis(page)
+    series = {
+        "Domestic": ([60, 70, 80, 50], (0.2, 0.4, 0.7)),
+        "International": ([40, 50, 30, 20], (0.8, 0.3, 0.1)),
+    }
+    totals = [0] * len(YEARS)
+    for values, colour in series.values():
+        for i, value in enumerate(values):
+            x = LEFT + 20 + i * 100
+            page.draw_rect(
+                pymupdf.Rect(x, y_for(totals[i] + value), x + 40, y_for(totals[i])),
+                color=None,
+                fill=colour,
+            )
+            totals[i] += value
+    for s, (name, (_, colour)) in enumerate(series.items()):
+        page.draw_rect(
+            pymupdf.Rect(450, 60 + s * 15, 458, 68 + s * 15), color=None, fill=colour
+        )
+        page.insert_text((462, 67 + s * 15), name, fontsize=8)
+
+    chart = extract_chart_data(page)
+
+    assert chart.chart_type == "stacked_bar"
+    for name, (values, _) in series.items():
+        assert chart.series[name] == pytest.approx(values, abs=0.5)
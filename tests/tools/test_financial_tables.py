@@ -0,0 +1,91 @@
+import polars as pl
+import pytest
+
+from fin_agent.utils.financial_tables import FinancialTable, parse_financial_value
+
+ROWS = [
+    ["", "2009", "2008", "notes"],
+    ["net income", "$ 103,102", "$ 104,222", "audited"],
+    ["net loss on sale", "( 1,234 )", "-", ""],
+    ["gross margin", "42.5%", "40.1 %", ""],
+    ["revenue", "$1.2 million", "$ (0.5) million", "restated"],
+]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1,234", (1234.0, None)),
+        ("(1,234)", (-1234.0, None)),
+        ("( 1,234 )", (-1234.0, None)),
+        ("$ (1,234)", (-1234.0, "$")),
+        ("-12.5", (-12.5, None)),
+        ("$ -12.5", (-12.5, "$")),
+        ("12.5 %", (12.5, "%")),
+        ("(3.2)%", (-3.2, "%")),
+        ("$ (0.5) million", (-500000.0, "$")),
+        ("$ 1.5 million", (1500000.0, "$")),
+        ("2.1bn", (2.1e9, None)),
+        ("—", (None, None)),
+        ("n/a", (None, None)),
+        ("net income", (None, None)),
+    ],
+)
+def test_parse_financial_value(text, expected):
+    assert parse_financial_value(text) == expected
+
+
+def test_from_rows_types_numeric_columns():
+    table = FinancialTable.from_rows("table_1", ROWS)
+
+    assert table.frame.schema == pl.Schema(
+        {"row": pl.String, "2009": pl.Float64, "2008": pl.Float64, "notes": pl.String}
+    )
+    assert table.frame["2009"].to_list() == [103102.0, -1234.0, 42.5, 1200000.0]
+    assert table.frame["2008"].to_list() == [104222.0, None, 40.1, -500000.0]
+    assert table.units[("gross margin", "2008")] == "%"
+    assert table.units[("net income", "2009")] == "$"
+    assert ("net loss on sale", "2009") not in table.units
+
+
+def test_from_rows_makes_headers_unique():
+    table = FinancialTable.from_rows(
+        "table_1", [["", "2009", "2009"], ["total", "1", "2"], ["total", "3", "4"]]
+    )
+
+    assert table.columns == ["2009", "2009 (2)"]
+    assert table.row_headers == ["total", "total (2)"]
+
+
+def test_schema_omits_values():
+    schema = FinancialTable.from_rows("table_1", ROWS).schema()
+
+    assert schema.splitlines() == [
+        "table_1: 4 rows x 3 columns",
+        "  columns: 2009 | 2008 | notes",
+        "  rows: net income | net loss on sale | gross margin | revenue",
+    ]
+    assert "103" not in schema
+
+
+def test_lookup_matches_headers_loosely():
+    table = FinancialTable.from_rows("table_1", ROWS)
+
+    assert table.lookup("Net Income", "2009") == {
+        "table": "table_1",
+        "row": "net income",
+        "column": "2009",
+        "value": 103102.0,
+        "unit": "$",
+    }
+    assert table.lookup("margin", " 2008 ")["value"] == 40.1
+    assert table.lookup("revenue", "notes")["value"] == "restated"
+
+
+def test_lookup_rejects_unknown_and_ambiguous_headers():
+    table = FinancialTable.from_rows("table_1", ROWS)
+
+    with pytest.raises(KeyError, match="No row matches"):
+        table.lookup("operating income", "2009")
+    with pytest.raises(KeyError, match="Several rows match"):
+        table.lookup("net", "2009")
@@ -0,0 +1,133 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pymupdf
+import pytest
+import ujson as json
+
+from fin_agent.agents.document_parser.bbox_inspector import BBoxInspectorResponse
+from fin_agent.agents.document_parser.content_summarizer import (
+    ContentSummarizerResponse,
+)
+from fin_agent.agents.document_parser.models import BoundingBox, PageSection
+from fin_agent.utils.memory import MB, MemoryBudget, current_rss_bytes, release_memory
+from fin_agent.workflows.extract_document_context import PdfContextExtractionWorkflow
+
+N_PAGES = 300
+N_WARMUP_PAGES = 50
+MAX_RSS_GROWTH_MB = 25
+
+
+def generate_pdf(n_pages: int) -> bytes:
+    document = pymupdf.open()
+    for page_number in range(n_pages):
+        page = document.new_page()
+        page.insert_text((72, 72), f"Annual report page {page_number}", fontsize=14)
+        rows = [f"Net sales {row} {page_number * row:,}" for row in range(20)]
+        page.insert_text((80, 116), "\n".join(rows), lineheight=1.5)
+        shape = page.new_shape()
+        for row in range(20):
+            shape.draw_line((72, 120 + row * 18), (540, 120 + row * 18))
+        shape.finish()
+        shape.commit()
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 64, 64), False)
+        pixmap.set_rect(pixmap.irect, (page_number % 255, 0, 0))
+        page.insert_image(pymupdf.Rect(72, 520, 272, 720), pixmap=pixmap)
+    return document.tobytes()
+
+
+@pytest.fixture
+def pdf_url(serve_pdf):
+    return serve_pdf(generate_pdf(N_PAGES))
+
+
+class StubAgentPool:
+    """Stands in for an agent pool, with agents which always give the same response."""
+
+    def __init__(self, response):
+        self.agent = SimpleNamespace(
+            run=lambda **kwargs: SimpleNamespace(content=response)
+        )
+
+    @contextmanager
+    def acquire(self, session_id=None):
+        yield self.agent
+
+
+@pytest.fixture
+def workflow():
+    # The pages have images, so go through the full vision pipeline: text is
+    # extracted and the figure is cropped into the (stored) output
+    sections = [
+        PageSection(
+            content_type="other",
+            overview={
+                "text_subtype": "body_text",
+                "first_three_words": "Annual report page",
+                "last_three_words": "Net sales 19",
+            },
+            y_min=5,
+            y_max=60,
+        ),
+        PageSection(
+            content_type="graph",
+            overview={"axis_labels": []},
+            y_min=65,
+            y_max=92,
+        ),
+    ]
+    workflow = PdfContextExtractionWorkflow()
+    workflow.content_summarizer_pool = StubAgentPool(
+        ContentSummarizerResponse(sections=sections)
+    )
+    workflow.bbox_inspector_pool = StubAgentPool(
+        BBoxInspectorResponse(
+            is_accurate=True,
+            reasoning="",
+            contains_content_not_specified_in_section=False,
+            is_missing_content_specified_in_section=False,
+            suggested_bounding_box=BoundingBox(x_min=10, y_min=65, x_max=45, y_max=92),
+        )
+    )
+    return workflow
+
+
+def process_page(workflow, pdf_url: str, page_number: int) -> None:
+    message = json.dumps({"pdf_url": pdf_url, "page_number": page_number})
+    parsed_page = workflow.run(message=message).content
+    assert parsed_page.route == "vision"
+    assert len(parsed_page.page_images) == 1
+
+
+def test_memory_stays_flat_over_many_pages(workflow, pdf_url, page_store):
+    for page_number in range(N_WARMUP_PAGES):
+        process_page(workflow, pdf_url, page_number)
+    release_memory()
+    baseline_rss = current_rss_bytes()
+
+    peak_rss = baseline_rss
+    for page_number in range(N_WARMUP_PAGES, N_PAGES):
+        process_page(workflow, pdf_url, page_number)
+        peak_rss = max(peak_rss, current_rss_bytes())
+
+    assert (peak_rss - baseline_rss) / MB < MAX_RSS_GROWTH_MB
+    assert len(page_store) == N_PAGES
+
+
+def test_memory_budget():
+    assert MemoryBudget(None).wait_for_capacity()
+    assert MemoryBudget(current_rss_bytes() / MB * 10).wait_for_capacity()
+
+    budget = MemoryBudget(1, poll_interval=0.01, timeout=0.05)
+    assert budget.is_over_budget()
+    assert not budget.wait_for_capacity()
+
+
+def test_memory_budget_calls_on_over_budget():
+    calls = []
+    budget = MemoryBudget(
+        1, poll_interval=0.01, timeout=0.05, on_over_budget=lambda: calls.append(1)
+    )
+
+    assert not budget.wait_for_capacity()
+    assert calls
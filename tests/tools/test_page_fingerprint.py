@@ -0,0 +1,40 @@
+import pymupdf
+
+from fin_agent.utils.page_fingerprint import fingerprint_pdf_page
+
+
+def make_document(page_texts: list[str]) -> pymupdf.Document:
+    document = pymupdf.open()
+    for text in page_texts:
+        page = document.new_page()
+        page.insert_text((72, 72), text)
+    return document
+
+
+def test_unchanged_pages_share_fingerprint_across_documents():
+    original = make_document(["Cover page", "Net sales 100", "Boilerplate"])
+    revised = make_document(["Cover page", "Net sales 120", "Boilerplate"])
+
+    original_fingerprints = [fingerprint_pdf_page(page) for page in original]
+    revised_fingerprints = [fingerprint_pdf_page(page) for page in revised]
+
+    assert original_fingerprints[0] == revised_fingerprints[0]
+    assert original_fingerprints[1] != revised_fingerprints[1]
+    assert original_fingerprints[2] == revised_fingerprints[2]
+
+
+def test_fingerprint_is_independent_of_page_position():
+    document = make_document(["Boilerplate", "Net sales 100", "Boilerplate"])
+    assert fingerprint_pdf_page(document[0]) == fingerprint_pdf_page(document[2])
+
+
+def test_fingerprint_includes_images():
+    fingerprints = []
+    for fill in (0, 255):
+        document = make_document(["Chart"])
+        pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 10, 10), False)
+        pixmap.set_rect(pixmap.irect, (fill, fill, fill))
+        document[0].insert_image(pymupdf.Rect(100, 100, 200, 200), pixmap=pixmap)
+        fingerprints.append(fingerprint_pdf_page(document[0]))
+
+    assert fingerprints[0] != fingerprints[1]
@@ -0,0 +1,68 @@
+import pymupdf
+
+from fin_agent.utils.page_profile import choose_route, profile_pdf_page
+
+
+def new_page() -> pymupdf.Page:
+    return pymupdf.open().new_page()
+
+
+def test_text_page():
+    page = new_page()
+    page.insert_text((72, 72), "\n".join(["Results of operations"] * 20))
+    assert choose_route(profile_pdf_page(page)) == "text_only"
+
+
+def test_ruled_table_page():
+    page = new_page()
+    for row in range(20):
+        y = 100 + row * 16
+        page.insert_text((80, y - 4), f"Line {row}")
+        page.draw_line((72, y), (540, y))
+    profile = profile_pdf_page(page)
+    assert profile.ruling_density >= 1.5
+    assert choose_route(profile) == "table"
+
+
+def test_whitespace_table_page():
+    page = new_page()
+    rows = [f"Net sales {row}    {row * 120:,}    {row * 95:,}" for row in range(1, 15)]
+    page.insert_text((72, 100), "\n".join(["Summary of results", *rows]))
+    assert choose_route(profile_pdf_page(page)) == "table"
+
+
+def test_chart_page():
+    page = new_page()
+    page.insert_text((72, 72), "Cumulative total return")
+    for i, height in enumerate([100, 140, 120, 180]):
+        x = 100 + i * 60
+        page.draw_rect(pymupdf.Rect(x, 500 - height, x + 30, 500), fill=(0, 0, 1))
+    assert choose_route(profile_pdf_page(page)) == "vision"
+
+
+def test_scanned_page():
+    page = new_page()
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 50, 50), False)
+    page.insert_image(page.rect, pixmap=pixmap)
+    profile = profile_pdf_page(page)
+    assert not profile.has_text_layer
+    assert choose_route(profile) == "vision"
+
+
+def test_blank_page():
+    assert choose_route(profile_pdf_page(new_page())) == "text_only"
+
+
+def test_prose_quoting_amounts_is_text_only():
+    page = new_page()
+    paragraph = (
+        "Net sales increased 12% to $1,234 million in 2009 compared to $1,102 "
+        "million in 2008, and operating income rose 8% to $310 million from $287 "
+        "million. Cash provided by operations was $402 million in 2009 and $377 "
+        "million in 2008, while capital expenditures were $96 million and $88 "
+        "million. "
+    ) * 4
+    page.insert_textbox(pymupdf.Rect(72, 72, 540, 720), paragraph, fontsize=10)
+    profile = profile_pdf_page(page)
+    assert profile.numeric_row_ratio < 0.3
+    assert choose_route(profile) == "text_only"
@@ -0,0 +1,36 @@
+import time
+
+from fin_agent.utils.page_store import PageStore
+
+
+def test_pages_are_shared_between_stores_on_the_same_file(tmp_path):
+    PageStore(tmp_path / "pages.db").put("fingerprint", {"page_content": ["text"]})
+
+    store = PageStore(tmp_path / "pages.db")
+    assert store.get("fingerprint") == {"page_content": ["text"]}
+    assert store.get("other") is None
+
+
+def test_least_recently_used_pages_are_dropped_over_the_size_limit(tmp_path):
+    output = {"page_content": ["x" * 1000]}
+    store = PageStore(tmp_path / "pages.db", max_mb=2500 / 1024 / 1024)
+    store.put("a", output)
+    time.sleep(0.01)
+    store.put("b", output)
+    time.sleep(0.01)
+    store.get("a")
+    store.put("c", output)
+
+    assert store.get("b") is None
+    assert store.get("a") == output
+    assert store.get("c") == output
+
+
+def test_pages_unused_for_max_age_are_dropped(tmp_path):
+    store = PageStore(tmp_path / "pages.db", max_age_days=0.05 / 86400)
+    store.put("old", {})
+    time.sleep(0.1)
+    store.put("new", {})
+
+    assert store.get("old") is None
+    assert len(store) == 1
@@ -0,0 +1,134 @@
+import pymupdf
+import pytest
+import ujson as json
+
+from fin_agent.agents.action_generation.action_planner import (
+    create_action_planner_advanced,
+)
+from fin_agent.agents.action_generation.table_tools import TableQueryTools
+from fin_agent.utils import document_parsing
+from fin_agent.workflows.extract_document_context import PdfContextExtractionWorkflow
+
+
+@pytest.fixture
+def pdf_url(serve_pdf):
+    document = pymupdf.open()
+    for text in ("Management's discussion", "Risk factors", "Management's discussion"):
+        page = document.new_page()
+        page.insert_text((72, 72), text)
+    return serve_pdf(document.tobytes())
+
+
+def run_workflow(workflow, pdf_url: str, page_number: int):
+    message = json.dumps({"pdf_url": pdf_url, "page_number": page_number})
+    return workflow.run(message=message).content
+
+
+def test_text_pages_skip_the_vision_pipeline(pdf_url):
+    workflow = PdfContextExtractionWorkflow()
+
+    parsed_page = run_workflow(workflow, pdf_url, 0)
+
+    assert parsed_page.route == "text_only"
+    assert parsed_page.page_content == ["Management's discussion\n"]
+    assert workflow.session_state["route_counts"] == {"text_only": 1}
+
+
+def test_identical_pages_are_processed_once(pdf_url, page_store):
+    workflow = PdfContextExtractionWorkflow()
+
+    run_workflow(workflow, pdf_url, 0)
+    run_workflow(workflow, pdf_url, 1)
+    parsed_page = run_workflow(workflow, pdf_url, 2)
+
+    assert parsed_page.page_content == ["Management's discussion\n"]
+    assert len(page_store) == 2
+    assert workflow.session_state["route_counts"] == {"text_only": 2}
+
+
+def generate_filing(n_pages: int, revised_pages: set[int]) -> bytes:
+    document = pymupdf.open()
+    for page_number in range(n_pages):
+        page = document.new_page()
+        revision = " (revised)" if page_number in revised_pages else ""
+        page.insert_text((72, 72), f"Annual report page {page_number}{revision}")
+    return document.tobytes()
+
+
+def test_revised_filings_only_process_the_changed_pages(serve_pdf, page_store):
+    # Longer than any in-process cache would hold, and processed in page order
+    n_pages = 300
+    workflow = PdfContextExtractionWorkflow()
+    pdf_url = serve_pdf(generate_filing(n_pages, revised_pages=set()))
+    for page_number in range(n_pages):
+        run_workflow(workflow, pdf_url, page_number)
+
+    # The revision is processed by another workflow (e.g. another worker process)
+    workflow = PdfContextExtractionWorkflow()
+    pdf_url = serve_pdf(generate_filing(n_pages, revised_pages={3, 150, 299}))
+    for page_number in range(n_pages):
+        parsed_page = run_workflow(workflow, pdf_url, page_number)
+
+    assert parsed_page.page_content == ["Annual report page 299 (revised)\n"]
+    assert workflow.session_state["route_counts"] == {"text_only": 3}
+    assert len(page_store) == n_pages + 3
+
+
+def test_table_values_are_looked_up_rather_than_given_to_the_planner(
+    serve_pdf, monkeypatch
+):
+    document = pymupdf.open()
+    page = document.new_page()
+    page.insert_text((72, 72), "Consolidated results of operations")
+    rows = [("", "2009", "2008"), ("Net income", "103,102", "(104,222)")]
+    rows += [(f"Segment {i}", f"{i},111", f"{i},222") for i in range(1, 19)]
+    for i, row in enumerate(rows):
+        y = 120 + i * 16
+        for x, cell in zip((80, 300, 420), row):
+            page.insert_text((x, y - 4), cell)
+        page.draw_line((72, y), (540, y))
+    pdf_url = serve_pdf(document.tobytes())
+    # tabula's JSON output, with the area of the table in points
+    table = {
+        "top": 100,
+        "left": 72,
+        "bottom": 120 + len(rows) * 16,
+        "right": 540,
+        "data": [[{"text": cell} for cell in row] for row in rows],
+    }
+    monkeypatch.setattr(
+        document_parsing.tabula, "read_pdf", lambda *args, **kwargs: [table]
+    )
+
+    workflow = PdfContextExtractionWorkflow()
+    parsed_page = run_workflow(workflow, pdf_url, 0)
+
+    assert parsed_page.route == "table"
+    planner = create_action_planner_advanced()
+    planner.session_id = workflow.session_id
+    context = "\n".join(
+        [
+            planner.get_system_message(planner.session_id).content,
+            *parsed_page.page_content,
+        ]
+    )
+    assert "Consolidated results of operations" in context
+    assert "page_1_table_1: 19 rows x 2 columns" in context
+    assert "lookup_table_value" in context
+    for value in ("103,102", "104,222", "1,111"):
+        assert value not in context
+    lookup = TableQueryTools().lookup_table_value
+    assert (
+        json.loads(lookup(planner, "page_1_table_1", "net income", "2008"))["value"]
+        == -104222.0
+    )
+
+    # Pages reused from the store register their tables in the new session
+    workflow = PdfContextExtractionWorkflow()
+    run_workflow(workflow, pdf_url, 0)
+    assert "route_counts" not in workflow.session_state
+    planner.session_id = workflow.session_id
+    assert (
+        json.loads(lookup(planner, "page_1_table_1", "segment 3", "2009"))["value"]
+        == 3111.0
+    )